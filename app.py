@@ -1,9 +1,14 @@
+import time
+
+script_started = time.perf_counter()
+
 import streamlit as st
-import base64
 from datetime import date
-from pages.overview import show_overview
-from pages.visualizations import show_visualizations
-from pages.insights import show_insights
+# Các trang (và plotly) chỉ được import khi được chọn lần đầu
+from utils.page_registry import PAGES, load_page, record_startup, show_startup_report
+from utils.data_loader import get_manifest
+from utils.perf import begin_rerun, end_rerun, show_perf_panel
+from utils.refresh import show_refresh_status, start_watcher
 
 # Cấu hình giao diện
 st.set_page_config(
@@ -23,6 +28,9 @@ try:
 except FileNotFoundError:
     st.warning("Style file not found. Using default styles.")
 
+# Watcher chạy nền, công bố phiên bản mới khi file dữ liệu thay đổi
+start_watcher()
+
 # Hiệu ứng gradient cho header
 def add_bg_gradient():
     st.markdown(
@@ -70,7 +78,7 @@ with st.sidebar:
     
     page = st.radio(
         "📌 Choose a section",
-        ["Overview", "Visualizations", "Advanced Insights"],
+        list(PAGES),
         key="navigation"
     )
     
@@ -78,12 +86,14 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("Dashboard Summary")
     
+    # Đọc từ manifest của dataset, không cần nạp dữ liệu
+    manifest = get_manifest()
     col1, col2 = st.columns(2)
-    col1.metric("Total Items", "847")
-    col2.metric("Categories", "15")
+    col1.metric("Total Items", f"{manifest['rows']:,}")
+    col2.metric("Categories", manifest["columns"]["Category"]["distinct"])
     
-    st.progress(80)
-    st.caption("Data completeness: 80%")
+    st.progress(manifest["completeness"])
+    st.caption(f"Data completeness: {manifest['completeness']:.0%}")
     
     # Thêm footer đẹp hơn
     st.markdown("---")
@@ -116,12 +126,14 @@ with main_container:
         unsafe_allow_html=True
     )
       # Nội dung theo trang
-    if page == "Overview":
-        show_overview()
-    elif page == "Visualizations":
-        show_visualizations()
-    elif page == "Advanced Insights":
-        show_insights()
+    begin_rerun()
+    load_page(page)()
+    end_rerun(page)
+
+record_startup(page, script_started)
+show_startup_report()
+show_perf_panel()
+show_refresh_status()
 
 # Thêm watermark subtle
 st.markdown(
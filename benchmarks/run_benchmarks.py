@@ -0,0 +1,218 @@
+# Benchmark headless cho từng trang (cách chạy: xem README). Mỗi kịch bản chạy app.py qua AppTest
+# trên dataset tổng hợp, trong một subprocess riêng để thời gian gồm cả lần nạp đầu và RSS đỉnh
+# là của riêng kịch bản; kết quả ghi vào benchmarks/results/<label>.json
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from utils.backend import BACKEND, BACKENDS
+
+# app.py dùng đường dẫn tương đối (assets/, data/) nên luôn chạy từ thư mục gốc repo
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+RESULTS_DIR = "benchmarks/results"
+DEFAULT_ROWS = [10_000, 1_000_000, 10_000_000]
+REGRESSION_THRESHOLD = 0.10
+
+
+def _select(label, value):
+    return lambda at: next(w for w in at.selectbox if w.label == label).set_value(value)
+
+
+def _multiselect(label, value):
+    return lambda at: next(w for w in at.multiselect if w.label == label).set_value(value)
+
+
+def _slider(label, value):
+    return lambda at: next(w for w in at.slider if w.label == label).set_value(value)
+
+
+def _number(label, value):
+    return lambda at: next(w for w in at.number_input if w.label == label).set_value(value)
+
+
+# Tên kịch bản -> (trang, các bước thay đổi widget)
+SCENARIOS = {
+    "overview": ("Overview", []),
+    "overview_filter": ("Overview", [
+        ("gender", _select("Select Gender", "Female")),
+        ("season", _select("Select Season", "Winter")),
+    ]),
+    "overview_sort_page": ("Overview", [
+        ("sort", _select("Sort By", "Purchase Amount (USD)")),
+        ("page", _number("Page", 3)),
+    ]),
+    "visualizations": ("Visualizations", []),
+    "visualizations_filter": ("Visualizations", [
+        ("age_range", _slider("Age Range", (25, 45))),
+        ("genders", _multiselect("Select Genders", ["Female"])),
+    ]),
+    # Rerun cả trang với bộ lọc mới: cả bốn figure đều phải dựng lại
+    "visualizations_rerun": ("Visualizations", [
+        ("age_25_45", _slider("Age Range", (25, 45))),
+        ("age_30_60", _slider("Age Range", (30, 60))),
+        ("genders", _multiselect("Select Genders", ["Female"])),
+        ("age_20_40", _slider("Age Range", (20, 40))),
+    ]),
+    "visualizations_chart_type": ("Visualizations", [
+        ("box_plot", _select("Chart Type", "Box Plot")),
+        ("violin_plot", _select("Chart Type", "Violin Plot")),
+        ("seasonal_metric", _select("Seasonal Metric", "Item Count")),
+    ]),
+    "insights": ("Advanced Insights", []),
+    "insights_analysis_switch": ("Advanced Insights", [
+        ("distribution", _select("Select Analysis Type", "Distribution Analysis")),
+        ("outliers", _select("Select Analysis Type", "Outlier Detection")),
+        ("segment", _select("Segment customers by", "Age Group")),
+    ]),
+}
+
+
+def _payload_bytes(at):
+    # Tổng kích thước protobuf của mọi element/block được gửi ở lần rerun cuối
+    total = 0
+    for root in (at.main, at.sidebar):
+        for node in root:
+            proto = getattr(node, "proto", None)
+            if proto is not None and hasattr(proto, "ByteSize"):
+                total += proto.ByteSize()
+    return total
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(name, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    page, actions = SCENARIOS[name]
+    steps = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    started = time.perf_counter()
+    at.run()
+    if page != "Overview":
+        at.sidebar.radio[0].set_value(page).run()
+    steps.append({"step": "load", "wall_s": time.perf_counter() - started, "payload_bytes": _payload_bytes(at)})
+
+    for step, action in actions:
+        started = time.perf_counter()
+        action(at)
+        at.run()
+        steps.append({"step": step, "wall_s": time.perf_counter() - started, "payload_bytes": _payload_bytes(at)})
+
+    errors = [str(exception.value) for exception in at.exception]
+    return {
+        "scenario": name,
+        "steps": steps,
+        "wall_s": sum(step["wall_s"] for step in steps),
+        "payload_bytes": sum(step["payload_bytes"] for step in steps),
+        "peak_rss_mb": _peak_rss_mb(),
+        "errors": errors,
+    }
+
+
+def _run_worker(name, rows, timeout, backend):
+    from benchmarks.synthetic import make_dataset
+
+    env = dict(os.environ, SHOPPING_DATA_PATH=make_dataset(rows), SHOPPING_BACKEND=backend)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker", name, "--timeout", str(timeout)],
+        env=env, cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        return {"scenario": name, "rows": rows, "backend": backend, "errors": completed.stderr.strip().splitlines()[-1:]}
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["rows"] = rows
+    result["backend"] = backend
+    return result
+
+
+def _default_label():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    with open(baseline_path) as f:
+        baseline = {(r["scenario"], r["rows"]): r for r in json.load(f)["results"]}
+    print(f"\nComparison with {baseline_path} (regression threshold {threshold:.0%}):")
+    regressions = 0
+    for result in results:
+        previous = baseline.get((result["scenario"], result["rows"]))
+        if previous is None or "wall_s" not in result or "wall_s" not in previous:
+            continue
+        change = result["wall_s"] / previous["wall_s"] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(
+            f"  {result['scenario']:<28} {result['rows']:>10,}  "
+            f"{previous['wall_s']:8.2f}s -> {result['wall_s']:8.2f}s  {change:+7.1%}  "
+            f"rss {previous['peak_rss_mb']:7.0f} -> {result['peak_rss_mb']:7.0f} MB  {flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the Shopping Trends dashboard.")
+    parser.add_argument("--rows", type=int, nargs="*", default=DEFAULT_ROWS)
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--label", default=None, help="Result file name (default: current git commit)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--backend", default=BACKEND, choices=list(BACKENDS), help="Query backend (default: SHOPPING_BACKEND)")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, args.timeout)))
+        return
+
+    results = []
+    for rows in args.rows:
+        for name in args.scenarios:
+            result = _run_worker(name, rows, args.timeout, args.backend)
+            results.append(result)
+            if "wall_s" in result:
+                print(
+                    f"{name:<28} {rows:>10,}  {result['wall_s']:8.2f}s  "
+                    f"{result['payload_bytes'] / 1024:9.1f} KB  {result['peak_rss_mb']:7.0f} MB RSS"
+                    + (f"  errors: {result['errors']}" if result["errors"] else ""),
+                    flush=True,
+                )
+            else:
+                print(f"{name:<28} {rows:>10,}  failed: {result['errors']}", flush=True)
+
+    label = args.label or _default_label()
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(output, "w") as f:
+        json.dump({
+            "label": label,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.data_loader import DATA_PATH, _read_source
+
+SYNTHETIC_DIR = "benchmarks/data"
+CHUNK_ROWS = 1_000_000
+
+
+def synthetic_path(rows):
+    return os.path.join(SYNTHETIC_DIR, f"shopping_trends_{rows}.parquet")
+
+
+def make_dataset(rows, seed=0, source=DATA_PATH):
+    # Bootstrap các dòng của dataset gốc: giữ nguyên schema, danh mục và phân phối
+    path = synthetic_path(rows)
+    if os.path.exists(path):
+        return path
+
+    base = _read_source(source)
+    rng = np.random.default_rng(seed)
+    os.makedirs(SYNTHETIC_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for start in range(0, rows, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, rows - start)
+            chunk = base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+            chunk["Customer ID"] = np.arange(start + 1, start + size + 1, dtype="int64")
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import data_loader
+from utils.backend import DuckDBBackend, PandasBackend
+from utils.data_loader import get_data_version
+from utils.segments import SEGMENT_SCHEMES
+
+FILTERS = [
+    None,
+    {"Gender": ["Female"], "Age": (20, 50)},
+    {"Season": "Winter", "Category": ["Clothing", "Footwear"]},
+    {"Gender": []},
+]
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return pd.read_excel("data/shopping_trends.xlsx")
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch, rows):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "shopping.csv")
+    rows.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def backends(csv_path):
+    version = get_data_version(csv_path)
+    return PandasBackend(csv_path, version), DuckDBBackend(csv_path, version)
+
+
+@pytest.mark.parametrize("column", ["Category", "Gender", "Season", "Color", "Location"])
+def test_values_in_first_appearance_order(backends, column):
+    pandas_backend, duckdb_backend = backends
+
+    assert duckdb_backend.values(column) == pandas_backend.values(column)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_count_and_aggregate(backends, filters):
+    pandas_backend, duckdb_backend = backends
+
+    assert duckdb_backend.count(filters) == pandas_backend.count(filters)
+    pd.testing.assert_series_equal(
+        duckdb_backend.aggregate(filters=filters), pandas_backend.aggregate(filters=filters), check_dtype=False
+    )
+    if filters != {"Gender": []}:
+        pd.testing.assert_frame_equal(
+            duckdb_backend.aggregate(["Season", "Gender"], filters),
+            pandas_backend.aggregate(["Season", "Gender"], filters),
+            check_dtype=False,
+            check_index_type=False,
+            check_categorical=False,
+        )
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+@pytest.mark.parametrize("by", [None, "Gender", "Category"])
+def test_describe(backends, filters, by):
+    pandas_backend, duckdb_backend = backends
+
+    pd.testing.assert_frame_equal(
+        duckdb_backend.describe("Purchase Amount (USD)", by, filters),
+        pandas_backend.describe("Purchase Amount (USD)", by, filters),
+        check_dtype=False,
+        check_index_type=False,
+        check_categorical=False,
+        check_names=False,
+    )
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+@pytest.mark.parametrize("scheme", list(SEGMENT_SCHEMES))
+def test_segment_summary(backends, filters, scheme):
+    pandas_backend, duckdb_backend = backends
+
+    pd.testing.assert_frame_equal(
+        duckdb_backend.segment_summary(scheme, filters),
+        pandas_backend.segment_summary(scheme, filters),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+@pytest.mark.parametrize("column, by", [("Purchase Amount (USD)", None), ("Review Rating", "Season")])
+def test_box_stats(backends, filters, column, by):
+    pandas_backend, duckdb_backend = backends
+
+    expected = pandas_backend.box_stats(column, by, filters)
+    result = duckdb_backend.box_stats(column, by, filters)
+
+    assert [group for group, _ in result] == [group for group, _ in expected]
+    for (_, stats), (_, expected_stats) in zip(result, expected):
+        assert stats.keys() == expected_stats.keys()
+        for key, value in expected_stats.items():
+            np.testing.assert_allclose(stats[key], value, err_msg=key)
+
+
+def test_unordered_row_key_falls_back_to_row_number(tmp_path, monkeypatch, rows):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "shuffled.csv")
+    rows.sample(frac=1, random_state=0).to_csv(path, index=False)
+
+    backend = DuckDBBackend(path, get_data_version(path))
+
+    assert backend._row_key == "row_number() OVER ()"
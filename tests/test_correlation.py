@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from utils import data_loader
+from utils.backend import BACKENDS
+from utils.correlation import CORRELATION_COLUMNS
+from utils.data_loader import get_data_version, load_data
+
+FILTERS = {"Gender": "Female", "Season": ["Winter", "Spring"], "Age": (25, 55)}
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "shopping.csv")
+    pd.read_excel("data/shopping_trends.xlsx").to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, path):
+    return BACKENDS[request.param](path, get_data_version(path))
+
+
+def _subset(path):
+    data = load_data(path)
+    mask = (data["Gender"] == "Female") & data["Season"].isin(["Winter", "Spring"]) & data["Age"].between(25, 55)
+    return data.loc[mask, CORRELATION_COLUMNS]
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_filtered_correlation_matches_dataframe_corr(path, backend, method):
+    result = backend.correlation(CORRELATION_COLUMNS, method, FILTERS)
+
+    pd.testing.assert_frame_equal(result, _subset(path).corr(method), check_exact=False, atol=1e-9)
+
+
+def test_column_subset_keeps_requested_order(path, backend):
+    columns = ["Review Rating", "Age"]
+
+    result = backend.correlation(columns, "pearson", FILTERS)
+
+    pd.testing.assert_frame_equal(result, _subset(path)[columns].corr(), check_exact=False, atol=1e-9)
+
+
+def test_unfiltered_correlation_matches_dataframe_corr(path, backend):
+    data = load_data(path)
+
+    result = backend.correlation(CORRELATION_COLUMNS)
+
+    pd.testing.assert_frame_equal(result, data[CORRELATION_COLUMNS].corr(), check_exact=False, atol=1e-9)
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from utils import data_loader, export
+from utils.backend import PandasBackend
+from utils.data_loader import get_data_version, load_data
+
+FILTERS = {"Gender": ["Female"], "Age": (20, 50)}
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(export, "STATIC_DIR", str(tmp_path / "static"))
+    monkeypatch.setattr(export, "EXPORT_DIR", str(tmp_path / "static" / "exports"))
+    path = str(tmp_path / "shopping.csv")
+    pd.read_excel("data/shopping_trends.xlsx").to_csv(path, index=False)
+    return PandasBackend(path, get_data_version(path))
+
+
+def _expected(backend):
+    data = load_data(backend.path)
+    mask = (data["Gender"] == "Female") & data["Age"].between(20, 50)
+    return data[mask].reset_index(drop=True)
+
+
+def _read(path):
+    return pd.read_csv(path) if path.endswith(".csv") else pq.read_table(path).to_pandas()
+
+
+@pytest.mark.parametrize("fmt, part_bytes", [("CSV", 40 * 1024), ("Parquet", 12 * 1024)])
+def test_large_exports_are_split_into_parts_below_the_limit(backend, fmt, part_bytes):
+    directory, paths = export.export_filtered(backend, FILTERS, fmt, chunk_size=100, part_bytes=part_bytes)
+
+    assert len(paths) > 1
+    assert all(os.path.dirname(path) == directory for path in paths)
+    for path in paths:
+        # Footer Parquet nằm trong phần chừa sẵn của PART_BYTES, không tính vào ngân sách các batch
+        footer = pq.ParquetFile(path).metadata.serialized_size if fmt == "Parquet" else 0
+        assert os.path.getsize(path) - footer <= part_bytes
+    exported = pd.concat([_read(path) for path in paths], ignore_index=True)
+    expected = _expected(backend)
+    assert len(exported) == len(expected)
+    assert exported["Customer ID"].tolist() == expected["Customer ID"].tolist()
+
+
+def test_small_exports_are_one_file(backend):
+    _, paths = export.export_filtered(backend, FILTERS, "CSV")
+    assert len(paths) == 1
+    assert len(_read(paths[0])) == len(_expected(backend))
+
+
+def test_old_exports_are_removed(backend, monkeypatch):
+    directory, _ = export.export_filtered(backend, FILTERS, "CSV")
+    monkeypatch.setattr(export, "EXPORT_TTL", -1)
+    export._remove_old_exports()
+    assert not os.path.exists(directory)
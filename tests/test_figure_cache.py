@@ -0,0 +1,36 @@
+import plotly.graph_objects as go
+
+from utils.figure_cache import FigureCache, _figure_bytes, figure_key
+
+
+def _scatter(points):
+    return go.Figure(go.Scatter(x=list(range(points)), y=list(range(points))))
+
+
+def test_hits_return_the_cached_figure():
+    cache = FigureCache()
+    key = figure_key("scatter", "v1", {"Gender": ["Male"]}, size=10)
+    first = cache.get_or_build(key, lambda: _scatter(10))
+    assert cache.get_or_build(key, lambda: _scatter(99)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recent_figures_past_the_byte_budget():
+    size = _figure_bytes(_scatter(1000))
+    cache = FigureCache(max_bytes=int(size * 2.5))
+    for name in ["a", "b", "c"]:
+        cache.get_or_build(figure_key(name, "v1"), lambda: _scatter(1000))
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 2 * size <= stats["max_bytes"]
+    cache.get_or_build(figure_key("a", "v1"), lambda: _scatter(1000))
+    assert cache.misses == 4
+
+
+def test_figures_larger_than_the_budget_are_not_cached():
+    cache = FigureCache(max_bytes=100)
+    cache.get_or_build(figure_key("big", "v1"), lambda: _scatter(1000))
+    assert cache.stats()["entries"] == 0
+    assert cache.bytes == 0
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_index import FilterIndex
+from utils.schema import apply_schema
+
+FILTERS = [
+    {},
+    {"Gender": "Female"},
+    {"Category": ["Clothing", "Footwear"], "Season": "Winter"},
+    {"Age": (25, 40)},
+    {"Gender": "Male", "Age": (18, 30), "Season": ["Spring", "Fall"]},
+    {"Age": (0, 200)},
+    {"Age": (90, 99)},
+    {"Category": []},
+    {"Category": ["Clothing", "Not a category"]},
+    {"Color": ["Red", "Blue"], "Size": "L"},
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    return apply_schema(pd.read_excel("data/shopping_trends.xlsx"))
+
+
+def _mask(data, filters):
+    mask = np.ones(len(data), dtype=bool)
+    for column, condition in filters.items():
+        if isinstance(condition, tuple):
+            mask &= data[column].between(*condition).to_numpy()
+        else:
+            values = [condition] if isinstance(condition, str) else condition
+            mask &= data[column].isin(values).to_numpy()
+    return mask
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_select_and_count_match_pandas_masks(data, filters):
+    index = FilterIndex(data)
+    expected = np.flatnonzero(_mask(data, filters))
+
+    np.testing.assert_array_equal(index.select(filters), expected)
+    assert index.count(filters) == len(expected)
+
+
+@pytest.mark.parametrize("filters", FILTERS[:5])
+@pytest.mark.parametrize("column, ascending", [("Age", True), ("Category", False), ("Purchase Amount (USD)", True)])
+def test_ordered_select_matches_stable_sort(data, filters, column, ascending):
+    index = FilterIndex(data)
+    keys = data[column].cat.codes if isinstance(data[column].dtype, pd.CategoricalDtype) else data[column]
+    order = np.argsort(keys.to_numpy(), kind="stable")
+    expected = order[_mask(data, filters)[order]]
+
+    np.testing.assert_array_equal(index.ordered_select(filters, column, ascending), expected if ascending else expected[::-1])
+
+
+def test_appended_matches_full_rebuild(data):
+    # 203 dòng cũ (không chia hết cho 8, không có Winter) rồi nối thêm các dòng có giá trị mới
+    old_rows = data[data["Season"] != "Winter"].head(203)
+    merged = pd.concat([old_rows, data.head(500)], ignore_index=True)
+    index = FilterIndex(old_rows.reset_index(drop=True)).appended(merged)
+    expected = FilterIndex(merged)
+
+    assert index.n_rows == expected.n_rows
+    assert index.bitmaps["Season"].keys() == expected.bitmaps["Season"].keys()
+    for filters in FILTERS:
+        np.testing.assert_array_equal(index.select(filters), np.flatnonzero(_mask(merged, filters)))
+        assert index.count(filters) == expected.count(filters)
+    np.testing.assert_array_equal(index.sorted_rows["Age"], expected.sorted_rows["Age"])
+    np.testing.assert_array_equal(index.ordered_select({"Season": "Winter"}, "Age"), expected.ordered_select({"Season": "Winter"}, "Age"))
+
+
+def test_appending_no_rows_keeps_results(data):
+    rows = data.head(100)
+    index = FilterIndex(rows).appended(rows)
+
+    for filters in FILTERS:
+        np.testing.assert_array_equal(index.select(filters), np.flatnonzero(_mask(rows, filters)))
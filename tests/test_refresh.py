@@ -0,0 +1,165 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils import data_loader
+from utils.cube import DIMENSIONS, build_cube
+from utils.data_loader import (
+    _read_source,
+    dataset_cube,
+    dataset_filter_index,
+    get_artifact,
+    get_data_version,
+    get_manifest,
+    load_data,
+    load_dataset,
+)
+from utils.filter_index import FilterIndex
+from utils.manifest import ManifestBuilder
+from utils.refresh import DatasetWatcher
+
+SOURCE = "data/shopping_trends.xlsx"
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return pd.read_excel(SOURCE).head(300)
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch, rows):
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "shopping.csv")
+    rows.head(200).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def watcher(csv_path):
+    # Poll rất thưa: test tự gọi check() thay cho thread nền
+    watcher = DatasetWatcher(csv_path, interval=3600)
+    yield watcher
+    watcher.stop()
+
+
+def _warm(path):
+    # Dựng các artifact mà session sẽ dựng ở phiên bản hiện tại
+    version = get_data_version(path)
+    dataset_filter_index(path, version)
+    dataset_cube(path, version)
+    get_manifest(path)
+    return version
+
+
+def _sorted_cube(cube):
+    return cube.astype({dimension: str for dimension in DIMENSIONS}).sort_values(DIMENSIONS).reset_index(drop=True)
+
+
+def _assert_index_equal(index, expected):
+    assert index.n_rows == expected.n_rows
+    assert index.bitmaps.keys() == expected.bitmaps.keys()
+    for column, bitmaps in expected.bitmaps.items():
+        assert index.bitmaps[column].keys() == bitmaps.keys()
+        for value, bits in bitmaps.items():
+            np.testing.assert_array_equal(index.bitmaps[column][value], bits)
+    for column, values in expected.sorted_values.items():
+        np.testing.assert_array_equal(index.sorted_values[column], values)
+        np.testing.assert_array_equal(index.sorted_rows[column], expected.sorted_rows[column])
+
+
+def _assert_manifest_equal(manifest, expected):
+    for key in ("version", "rows", "completeness"):
+        assert manifest[key] == pytest.approx(expected[key])
+    assert manifest["columns"].keys() == expected["columns"].keys()
+    for name, stats in expected["columns"].items():
+        assert manifest["columns"][name] == pytest.approx(stats)
+
+
+def test_sessions_stay_on_published_version_until_check(csv_path, watcher, rows):
+    version = get_data_version(csv_path)
+    rows.iloc[200:210].to_csv(csv_path, mode="a", header=False, index=False)
+    assert get_data_version(csv_path) == version
+
+    watcher.check()
+    assert get_data_version(csv_path) != version
+
+
+def test_csv_append_matches_full_rebuild(csv_path, watcher, rows):
+    _warm(csv_path)
+    rows.iloc[200:].to_csv(csv_path, mode="a", header=False, index=False)
+
+    watcher.check()
+    assert watcher.events[0]["kind"] == "append"
+    assert watcher.events[0]["rows"] == 100
+
+    version = get_data_version(csv_path)
+    expected = _read_source(csv_path)
+    pd.testing.assert_frame_equal(get_artifact(csv_path, version, "data"), expected)
+    _assert_index_equal(get_artifact(csv_path, version, "index"), FilterIndex(expected))
+    pd.testing.assert_frame_equal(
+        _sorted_cube(get_artifact(csv_path, version, "cube")), _sorted_cube(build_cube(expected)), check_dtype=False
+    )
+    builder = ManifestBuilder()
+    builder.update(pa.Table.from_pandas(expected, preserve_index=False))
+    _assert_manifest_equal(get_artifact(csv_path, version, "manifest"), builder.result(version))
+
+
+def test_modified_row_rebuilds_from_source(csv_path, watcher, rows):
+    old_version = _warm(csv_path)
+    modified = rows.head(200).copy()
+    modified.loc[10, "Purchase Amount (USD)"] += 7
+    modified.loc[10, "Season"] = "Winter" if modified.loc[10, "Season"] != "Winter" else "Summer"
+    modified.to_csv(csv_path, index=False)
+
+    watcher.check()
+    assert watcher.events[0]["kind"] == "rebuild"
+
+    version = get_data_version(csv_path)
+    assert version != old_version
+    assert get_artifact(csv_path, version, "data") is None
+
+    expected = _read_source(csv_path)
+    pd.testing.assert_frame_equal(load_data(csv_path), expected)
+    _assert_index_equal(dataset_filter_index(csv_path, version), FilterIndex(expected))
+    pd.testing.assert_frame_equal(
+        _sorted_cube(dataset_cube(csv_path, version)), _sorted_cube(build_cube(expected)), check_dtype=False
+    )
+
+
+def _cache_files(csv_path, version):
+    prefix = os.path.basename(data_loader._cache_prefix(csv_path, version))
+    return [name for name in os.listdir(data_loader.CACHE_DIR) if name.startswith(prefix)]
+
+
+def test_old_version_kept_while_another_process_pins_it(csv_path, rows):
+    old_version = get_data_version(csv_path)
+    load_data(csv_path)
+    # Một process khác (còn sống) đang ghim phiên bản cũ
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        open(data_loader._reference_path(csv_path, old_version, other.pid), "a").close()
+        rows.iloc[200:210].to_csv(csv_path, mode="a", header=False, index=False)
+        load_data(csv_path)
+        assert any(name.endswith(".arrow") for name in _cache_files(csv_path, old_version))
+    finally:
+        other.kill()
+        other.wait()
+
+    # Process đó đã thoát: lần ghi kế tiếp dọn phiên bản cũ
+    rows.iloc[210:220].to_csv(csv_path, mode="a", header=False, index=False)
+    load_data(csv_path)
+    assert _cache_files(csv_path, old_version) == []
+
+
+def test_pinned_version_is_not_rebuilt_from_changed_source(csv_path, watcher, rows):
+    version = get_data_version(csv_path)
+    rows.iloc[200:210].to_csv(csv_path, mode="a", header=False, index=False)
+
+    with pytest.raises(RuntimeError, match="changed after version"):
+        load_dataset(csv_path, version)
+    assert not os.path.exists(data_loader._sidecar_path(csv_path, version))
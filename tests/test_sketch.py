@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.schema import apply_schema
+from utils.sketch import SKETCH_COLUMNS, KLLSketch, QuantileSketches
+
+QS = np.linspace(0.01, 0.99, 99)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return apply_schema(pd.read_excel("data/shopping_trends.xlsx"))
+
+
+def _assert_within_rank_error(sketch, values):
+    # Giá trị trả về cho q phải có hạng thật trong khoảng q ± rank_error
+    values = np.sort(values)
+    estimates = np.asarray(sketch.quantiles(QS))
+    below = np.searchsorted(values, estimates, side="left") / len(values)
+    at_or_below = np.searchsorted(values, estimates, side="right") / len(values)
+    assert sketch.rank_error > 0
+    assert np.all(below <= QS + sketch.rank_error)
+    assert np.all(at_or_below >= QS - sketch.rank_error)
+
+
+def _sketch_of(values):
+    sketch = KLLSketch()
+    sketch.update(values)
+    return sketch
+
+
+def test_small_streams_are_exact(data):
+    sketches = QuantileSketches()
+    for start in range(0, len(data), 1000):
+        sketches.update(data.iloc[start:start + 1000])
+
+    for column in SKETCH_COLUMNS:
+        assert sketches.rank_error(column) == 0
+        pd.testing.assert_frame_equal(sketches.describe(column), data[column].describe().to_frame().T)
+        expected = data.groupby("Category", observed=True)[column].describe()
+        pd.testing.assert_frame_equal(sketches.describe(column, "Category"), expected, check_index_type=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "integers", "lognormal"])
+def test_large_streams_stay_within_rank_error(distribution):
+    rng = np.random.default_rng(1)
+    values = {
+        "normal": rng.normal(50, 10, 200_000),
+        "integers": rng.integers(18, 71, 200_000).astype("float64"),
+        "lognormal": rng.lognormal(3, 1, 200_000),
+    }[distribution]
+    sketch = KLLSketch()
+    for batch in np.array_split(values, 40):
+        sketch.update(batch)
+
+    _assert_within_rank_error(sketch, values)
+    assert sketch.min == values.min() and sketch.max == values.max()
+    assert sketch.describe()["mean"] == pytest.approx(values.mean())
+    assert sum(len(items) for items in sketch.levels) < len(values) / 50
+
+
+def test_merged_sketches_stay_within_rank_error():
+    rng = np.random.default_rng(2)
+    parts = [rng.normal(0, 1, 50_000), rng.exponential(1, 30_000), np.full(20_000, 0.5)]
+    sketch = KLLSketch()
+    for part in parts:
+        sketch.merge(_sketch_of(part))
+
+    _assert_within_rank_error(sketch, np.concatenate(parts))
+    assert sketch.n == sum(len(part) for part in parts)
@@ -0,0 +1,689 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils.correlation import cube_matrix
+from utils.cube import CROSS_PAIRS, MEASURES, ROWS, _finalize, rollup
+from utils.distributions import (
+    DENSITY_BINS,
+    HISTOGRAM_BINS,
+    KDE_HISTOGRAM_BINS,
+    MAX_OUTLIER_POINTS,
+    SAMPLE_SIZE,
+    bin_edges,
+    box_summary,
+    density_grid,
+    group_rows,
+    histogram,
+    kde_bandwidth,
+    kde_from_histogram,
+    kde_range,
+    stratified_sample,
+    thin_positions,
+    violin_summary,
+)
+from utils.data_loader import (
+    DATA_PATH,
+    dataset_correlation_stats,
+    dataset_cube,
+    dataset_filter_index,
+    dataset_manifest,
+    dataset_memory_report,
+    dataset_segments,
+    get_data_version,
+    is_parquet,
+    load_dataset,
+    parts_path,
+    remove_stale_versions,
+)
+from utils.ingest import CHUNK_SIZE, STORAGE_TYPES, ingest
+from utils.manifest import MANIFEST_NAME, read_manifest
+from utils.schema import apply_schema
+from utils.segments import SEGMENT_MEASURES, SEGMENT_SCHEMES, segment_edges, summarize
+from utils.shared_store import sharing_report
+
+# "pandas" (toàn bộ dataset trong RAM) hoặc "duckdb" (truy vấn thẳng trên Parquet)
+BACKEND = os.environ.get("SHOPPING_BACKEND", "pandas")
+DESCRIBE_COLUMNS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+# Khoá duy nhất, tăng theo thứ tự dòng của file nguồn
+ROW_KEY = "Customer ID"
+# Giá trị lớn nhất của hash() trong DuckDB (UBIGINT)
+HASH_MAX = 2**64 - 1
+
+
+class QueryBackend:
+    # Các truy vấn mà các trang chạy trên dataset. filters là dict như của FilterIndex/rollup;
+    # kết quả có đúng dạng các trang đang dùng: aggregate như rollup, describe như Series.describe,
+    # box/violin/histogram/density như utils.distributions, select trả về (data, rows)
+
+    name = None
+
+    def columns(self):
+        raise NotImplementedError
+
+    def count(self, filters=None):
+        raise NotImplementedError
+
+    def values(self, column):
+        # Giá trị khác nhau theo thứ tự xuất hiện đầu tiên
+        raise NotImplementedError
+
+    def value_range(self, column):
+        raise NotImplementedError
+
+    def aggregate(self, by=None, filters=None):
+        raise NotImplementedError
+
+    def quantiles(self, column, qs, filters=None):
+        raise NotImplementedError
+
+    def describe(self, column, by=None, filters=None):
+        raise NotImplementedError
+
+    def correlation(self, columns, method="pearson", filters=None):
+        raise NotImplementedError
+
+    def window(self, filters, start, stop, columns=None, sort_by=None, ascending=True):
+        raise NotImplementedError
+
+    def outliers(self, column, lower, upper, columns, limit=10):
+        # (số dòng ngoài [lower, upper], tối đa `limit` dòng đầu tiên)
+        raise NotImplementedError
+
+    def segment_summary(self, scheme, filters=None):
+        # Khung theo phân khúc của utils.segments.summarize
+        raise NotImplementedError
+
+    def box_stats(self, column, by=None, filters=None, max_outliers=MAX_OUTLIER_POINTS):
+        # [(nhóm, box_summary)] theo thứ tự nhóm; by=None là một nhóm None
+        raise NotImplementedError
+
+    def violin_stats(self, column, by=None, filters=None):
+        # [(nhóm, violin_summary)]
+        raise NotImplementedError
+
+    def histogram(self, column, bins=HISTOGRAM_BINS, filters=None):
+        # (cạnh bin, số đếm)
+        raise NotImplementedError
+
+    def density_grid(self, x, y, color_by, size_by, bins=DENSITY_BINS, filters=None):
+        raise NotImplementedError
+
+    def sample(self, filters, columns, by, size=SAMPLE_SIZE):
+        # Mẫu phân tầng theo `by` của các dòng thoả mãn bộ lọc
+        raise NotImplementedError
+
+    def select(self, filters=None, columns=None):
+        raise NotImplementedError
+
+    def batches(self, filters=None, columns=None, chunk_size=CHUNK_SIZE):
+        # pa.RecordBatchReader qua các dòng thoả mãn bộ lọc, mỗi lần tối đa chunk_size dòng
+        raise NotImplementedError
+
+    def memory_report(self):
+        return None
+
+    def sharing_report(self, session_state):
+        # Bộ nhớ theo phạm vi: dùng chung giữa các process / trong process / riêng session
+        return None
+
+
+class PandasBackend(QueryBackend):
+    # Đường trong bộ nhớ: DataFrame dùng chung, bitmap FilterIndex và cube
+
+    name = "pandas"
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+
+    @property
+    def data(self):
+        return load_dataset(self.path, self.version)
+
+    @property
+    def index(self):
+        return dataset_filter_index(self.path, self.version)
+
+    def columns(self):
+        return self.data.columns.tolist()
+
+    def count(self, filters=None):
+        return self.index.count(filters or {})
+
+    def values(self, column):
+        return self.data[column].unique().tolist()
+
+    def value_range(self, column):
+        return self.data[column].min(), self.data[column].max()
+
+    def aggregate(self, by=None, filters=None):
+        return rollup(dataset_cube(self.path, self.version), by, filters)
+
+    def _column(self, column, filters):
+        series = self.data[column]
+        return series.iloc[self.index.select(filters)] if filters else series
+
+    def quantiles(self, column, qs, filters=None):
+        return self._column(column, filters).quantile(qs).tolist()
+
+    def describe(self, column, by=None, filters=None):
+        if by is None:
+            return self._column(column, filters).describe().to_frame().T
+        # Chỉ lấy hai cột cần dùng thay vì copy mọi cột của các dòng đã lọc
+        return self._column(column, filters).groupby(self._column(by, filters), observed=True).describe()
+
+    def correlation(self, columns, method="pearson", filters=None):
+        if not filters:
+            return dataset_correlation_stats(self.path, self.version).matrix(columns, method)
+        if method == "pearson":
+            # Tập đã lọc: roll-up các ô cube khớp bộ lọc thay vì quét lại các dòng
+            return cube_matrix(self.aggregate(filters=filters), columns)
+        # Hạng thay đổi theo bộ lọc nên Spearman phải tính trên chính các dòng đã lọc
+        return self.data[columns].iloc[self.index.select(filters)].corr(method)
+
+    def window(self, filters, start, stop, columns=None, sort_by=None, ascending=True):
+        if sort_by is None:
+            rows = self.index.select(filters)[start:stop]
+        else:
+            rows = self.index.ordered_select(filters, sort_by, ascending)[start:stop]
+        data = self.data
+        return data.iloc[rows, [data.columns.get_loc(column) for column in columns or data.columns]]
+
+    def outliers(self, column, lower, upper, columns, limit=10):
+        values = self.data[column].to_numpy()
+        rows = np.flatnonzero((values < lower) | (values > upper))
+        data = self.data
+        return len(rows), data.iloc[rows[:limit], [data.columns.get_loc(name) for name in columns]]
+
+    def segment_summary(self, scheme, filters=None):
+        rows = self.index.select(filters) if filters else None
+        return dataset_segments(self.path, self.version).summary(scheme, rows)
+
+    def _values(self, column, rows):
+        return self.data[column].to_numpy()[rows].astype("float64")
+
+    def box_stats(self, column, by=None, filters=None, max_outliers=MAX_OUTLIER_POINTS):
+        groups = group_rows(self.data, self.index.select(filters or {}), by)
+        return [(group, box_summary(self._values(column, rows), max_outliers)) for group, rows in groups]
+
+    def violin_stats(self, column, by=None, filters=None):
+        groups = group_rows(self.data, self.index.select(filters or {}), by)
+        return [(group, violin_summary(self._values(column, rows))) for group, rows in groups]
+
+    def histogram(self, column, bins=HISTOGRAM_BINS, filters=None):
+        return histogram(self._values(column, self.index.select(filters or {})), bins)
+
+    def density_grid(self, x, y, color_by, size_by, bins=DENSITY_BINS, filters=None):
+        return density_grid(self.data, self.index.select(filters or {}), x, y, color_by, size_by, bins)
+
+    def sample(self, filters, columns, by, size=SAMPLE_SIZE):
+        data = self.data
+        rows = stratified_sample(data, self.index.select(filters or {}), by, size)
+        return data.iloc[rows, [data.columns.get_loc(column) for column in columns]]
+
+    def select(self, filters=None, columns=None):
+        # Không copy: trả về frame dùng chung cùng vị trí các dòng thoả mãn bộ lọc
+        return self.data, self.index.select(filters or {})
+
+    def batches(self, filters=None, columns=None, chunk_size=CHUNK_SIZE):
+        data = self.data
+        rows = self.index.select(filters or {})
+        positions = [data.columns.get_loc(column) for column in columns or data.columns]
+        schema = pa.Schema.from_pandas(data.iloc[:0, positions], preserve_index=False)
+
+        def generate():
+            # Chỉ copy từng chunk dòng, không bao giờ cả tập đã lọc
+            for start in range(0, len(rows), chunk_size):
+                chunk = data.iloc[rows[start:start + chunk_size], positions]
+                yield pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+
+        return pa.RecordBatchReader.from_batches(schema, generate())
+
+    def memory_report(self):
+        return dataset_memory_report(self.path, self.version)
+
+    def sharing_report(self, session_state):
+        return sharing_report(self.data, session_state)
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _where(filters):
+    clauses, params = [], []
+    for column, condition in (filters or {}).items():
+        if isinstance(condition, tuple):
+            clauses.append(f"{_quote(column)} BETWEEN ? AND ?")
+            params += [condition[0], condition[1]]
+            continue
+        values = [condition] if isinstance(condition, str) or not np.iterable(condition) else list(condition)
+        if not values:
+            clauses.append("FALSE")
+            continue
+        clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+        params += values
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _and(where, condition):
+    return f"{where} AND {condition}" if where else f" WHERE {condition}"
+
+
+def _bin_sql(value, bins):
+    # Cùng công thức với utils.distributions.bin_index; tham số là (low, bins / (high - low))
+    return f"least(greatest(CAST(floor(({value} - ?) * ?) AS BIGINT), 0), {bins - 1})"
+
+
+def _parquet_source(path, version):
+    # DuckDB chỉ đọc Parquet; xlsx/CSV được ingest theo chunk một lần cho mỗi phiên bản
+    if is_parquet(path):
+        return path
+    output = parts_path(path, version)
+    if not os.path.exists(output):
+        ingest(path, output)
+        remove_stale_versions(path, version)
+    return output
+
+
+class DuckDBBackend(QueryBackend):
+    # DuckDB nhúng đọc dữ liệu Parquet: lọc và gộp chạy trong engine, Python chỉ nhận kết quả
+    # (aggregate, thống kê biểu đồ, một trang dòng, mẫu giới hạn) nên dataset có thể lớn hơn RAM
+
+    name = "duckdb"
+
+    def __init__(self, path, version):
+        import duckdb
+
+        source = _parquet_source(path, version)
+        self._connection = duckdb.connect()
+        if os.path.isdir(source):
+            scan = f"read_parquet({_sql_literal(os.path.join(source, '**', '*.parquet'))}, hive_partitioning = true)"
+            metadata_path = os.path.join(source, "_common_metadata")
+            names = pq.read_schema(metadata_path).names if os.path.exists(metadata_path) else None
+        else:
+            scan = f"read_parquet({_sql_literal(source)})"
+            names = None
+        # Giữ thứ tự cột gốc (cột partition được DuckDB đưa xuống cuối)
+        select_list = ", ".join(_quote(name) for name in names) if names else "*"
+        self._connection.execute(f"CREATE VIEW dataset AS SELECT {select_list} FROM {scan}")
+        self._columns = [row[0] for row in self._connection.execute("DESCRIBE dataset").fetchall()]
+        # Thứ tự dòng của nguồn gốc; dataset đã partition được đọc theo partition nên không dùng được thứ tự quét.
+        # ROW_KEY chỉ thay cho số thứ tự dòng khi manifest (dựng theo thứ tự ghi) xác nhận nó tăng ngặt
+        manifest_path = os.path.join(source, MANIFEST_NAME)
+        if is_parquet(path):
+            manifest = dataset_manifest(path, version)
+        elif os.path.exists(manifest_path):
+            manifest = read_manifest(manifest_path)
+        else:
+            manifest = {"columns": {}}
+        increasing = manifest["columns"].get(ROW_KEY, {}).get("increasing", False)
+        self._row_key = _quote(ROW_KEY) if increasing else "row_number() OVER ()"
+        self._values = {}
+        self._segment_summaries = {}
+
+    def _query(self, sql, params=()):
+        # Mỗi truy vấn dùng cursor riêng: connection được chia sẻ giữa các session
+        return self._connection.cursor().execute(sql, list(params))
+
+    def columns(self):
+        return list(self._columns)
+
+    def count(self, filters=None):
+        where, params = _where(filters)
+        return self._query(f"SELECT count(*) FROM dataset{where}", params).fetchone()[0]
+
+    def values(self, column):
+        if column not in self._values:
+            self._values[column] = [row[0] for row in self._query(
+                f"SELECT {_quote(column)} FROM (SELECT {_quote(column)}, {self._row_key} AS position "
+                f"FROM dataset WHERE {_quote(column)} IS NOT NULL) GROUP BY 1 ORDER BY min(position)"
+            ).fetchall()]
+        return self._values[column]
+
+    def value_range(self, column):
+        return self._query(f"SELECT min({_quote(column)}), max({_quote(column)}) FROM dataset").fetchone()
+
+    def aggregate(self, by=None, filters=None):
+        keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        expressions = [f"count(*) AS {_quote(f'{ROWS}:count')}"]
+        for measure in MEASURES:
+            column = _quote(measure)
+            # Tổng của tập rỗng là 0 như khi roll-up cube, không phải NULL
+            total = f"coalesce(sum({column}), 0)"
+            if pa.types.is_integer(STORAGE_TYPES.get(measure, pa.float64())):
+                total = f"CAST({total} AS BIGINT)"
+            expressions += [
+                f"{total} AS {_quote(f'{measure}:sum')}",
+                f"count({column}) AS {_quote(f'{measure}:count')}",
+                f"coalesce(sum(CAST({column} AS DOUBLE) * {column}), 0) AS {_quote(f'{measure}:sumsq')}",
+                f"min({column}) AS {_quote(f'{measure}:min')}",
+                f"max({column}) AS {_quote(f'{measure}:max')}",
+            ]
+        for first, second in CROSS_PAIRS:
+            expressions.append(
+                f"coalesce(sum(CAST({_quote(first)} AS DOUBLE) * {_quote(second)}), 0) AS {_quote(f'{first}*{second}:sum')}"
+            )
+        where, params = _where(filters)
+        group = ", ".join(_quote(key) for key in keys)
+        sql = f"SELECT {', '.join([*map(_quote, keys), *expressions])} FROM dataset{where}"
+        if keys:
+            sql += f" GROUP BY {group} ORDER BY {group}"
+        cells = self._query(sql, params).df()
+        # min/max của tập rỗng là NULL (kiểu Int nullable): đưa về NaN float như khi roll-up cube
+        cells = cells.astype({
+            column: "float64" for column in cells.columns
+            if ":" in column and pd.api.types.is_extension_array_dtype(cells[column]) and cells[column].hasnans
+        })
+        if not keys:
+            return _finalize(cells).iloc[0]
+        return _finalize(cells.set_index(by))
+
+    def quantiles(self, column, qs, filters=None):
+        where, params = _where(filters)
+        return list(self._query(
+            f"SELECT quantile_cont({_quote(column)}, ?) FROM dataset{where}", [list(qs), *params]
+        ).fetchone()[0])
+
+    def describe(self, column, by=None, filters=None):
+        value = _quote(column)
+        where, params = _where(filters)
+        sql = (
+            f"SELECT {'' if by is None else _quote(by) + ', '}"
+            f"CAST(count({value}) AS DOUBLE) AS \"count\", avg({value}) AS \"mean\", "
+            f"stddev_samp({value}) AS \"std\", CAST(min({value}) AS DOUBLE) AS \"min\", "
+            f"quantile_cont({value}, [0.25, 0.5, 0.75]) AS q, CAST(max({value}) AS DOUBLE) AS \"max\" "
+            f"FROM dataset{where}"
+        )
+        if by is not None:
+            sql += f" GROUP BY {_quote(by)} ORDER BY {_quote(by)}"
+        stats = self._query(sql, params).df()
+        quartiles = pd.DataFrame(stats.pop("q").tolist(), columns=["25%", "50%", "75%"], index=stats.index)
+        stats = pd.concat([stats, quartiles], axis=1)
+        if by is None:
+            return stats[DESCRIBE_COLUMNS].set_axis([column])
+        return stats.set_index(by)[DESCRIBE_COLUMNS]
+
+    def correlation(self, columns, method="pearson", filters=None):
+        if filters and method == "pearson":
+            # Cùng đường aggregate với PandasBackend: tổng tích chéo của tập đã lọc
+            return cube_matrix(self.aggregate(filters=filters), columns)
+        where, params = _where(filters)
+        source = f"(SELECT * FROM dataset{where})"
+        if method == "spearman":
+            # Hạng trung bình cho các giá trị bằng nhau, như Series.rank()
+            ranks = ", ".join(
+                f"CASE WHEN {_quote(column)} IS NULL THEN NULL ELSE "
+                f"rank() OVER (ORDER BY {_quote(column)}) + (count(*) OVER (PARTITION BY {_quote(column)}) - 1) / 2.0 "
+                f"END AS {_quote(column)}"
+                for column in columns
+            )
+            source = f"(SELECT {ranks} FROM {source})"
+        pairs = [(first, second) for i, first in enumerate(columns) for second in columns[i + 1:]]
+        result = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        if pairs:
+            values = self._query(
+                f"SELECT {', '.join(f'corr({_quote(a)}, {_quote(b)})' for a, b in pairs)} FROM {source}", params
+            ).fetchone()
+            for (first, second), value in zip(pairs, values):
+                result.loc[first, second] = result.loc[second, first] = np.nan if value is None else value
+        return result
+
+    def window(self, filters, start, stop, columns=None, sort_by=None, ascending=True):
+        where, params = _where(filters)
+        sql = f"SELECT {', '.join(map(_quote, columns or self._columns))} FROM dataset{where}"
+        # Khoá phụ duy nhất theo thứ tự dòng: các giá trị bằng nhau luôn ra cùng thứ tự giữa các trang
+        # và giống sort ổn định của PandasBackend (đảo ngược khi giảm dần)
+        if sort_by is None:
+            sql += f" ORDER BY {self._row_key}"
+        else:
+            direction = "ASC" if ascending else "DESC"
+            sql += f" ORDER BY {_quote(sort_by)} {direction}, {self._row_key} {direction}"
+        sql += " LIMIT ? OFFSET ?"
+        return apply_schema(self._query(sql, [*params, max(stop - start, 0), start]).df())
+
+    def outliers(self, column, lower, upper, columns, limit=10):
+        condition = f" WHERE {_quote(column)} < ? OR {_quote(column)} > ?"
+        total = self._query(f"SELECT count(*) FROM dataset{condition}", [lower, upper]).fetchone()[0]
+        head = self._query(
+            f"SELECT {', '.join(map(_quote, columns))} FROM dataset{condition} LIMIT ?", [lower, upper, limit]
+        ).df()
+        return total, apply_schema(head)
+
+    def segment_summary(self, scheme, filters=None):
+        key = (scheme, repr(sorted((filters or {}).items())))
+        if key in self._segment_summaries:
+            return self._segment_summaries[key]
+        column, bins, labels = SEGMENT_SCHEMES[scheme]
+        # Cạnh bin tính trên toàn bộ dataset, như SegmentTable
+        edges = segment_edges(bins, *(float(value) for value in self.value_range(column)))
+        code = "CASE " + " ".join(
+            f"WHEN {_quote(column)} > {float(edges[i])!r} AND {_quote(column)} <= {float(edges[i + 1])!r} THEN {i}"
+            for i in range(len(labels))
+        ) + " END"
+        expressions = ", ".join(
+            f"sum({_quote(measure)}), count({_quote(measure)})" for measure in SEGMENT_MEASURES
+        )
+        where, params = _where(filters)
+        found = {
+            row[0]: row[1:]
+            for row in self._query(
+                f"SELECT {code} AS segment, count(*), {expressions} FROM dataset{where} GROUP BY 1", params
+            ).fetchall()
+            if row[0] is not None
+        }
+        empty = (0,) + (None, 0) * len(SEGMENT_MEASURES)
+        cells = [found.get(i, empty) for i in range(len(labels))]
+        sums = {m: np.array([c[1 + 2 * k] or 0 for c in cells], dtype="float64") for k, m in enumerate(SEGMENT_MEASURES)}
+        value_counts = {m: np.array([c[2 + 2 * k] for c in cells], dtype=np.int64) for k, m in enumerate(SEGMENT_MEASURES)}
+        summary = summarize(labels, np.array([c[0] for c in cells], dtype=np.int64), sums, value_counts)
+        self._segment_summaries[key] = summary
+        return summary
+
+    def _group_values(self, column, by, filters):
+        # (SQL của bảng (g, v) gồm các giá trị khác null của column theo nhóm, tham số)
+        where, params = _where(filters)
+        where = _and(where, f"{_quote(column)} IS NOT NULL")
+        if by is not None:
+            where = _and(where, f"{_quote(by)} IS NOT NULL")
+        group = "NULL" if by is None else _quote(by)
+        return (
+            f"SELECT CAST({group} AS VARCHAR) AS g, CAST({_quote(column)} AS DOUBLE) AS v FROM dataset{where}", params
+        )
+
+    def _group_stats(self, column, by, filters):
+        # Thống kê của box_summary cho từng nhóm, tính hết trong DuckDB
+        values, params = self._group_values(column, by, filters)
+        rows = self._query(
+            f"WITH v AS ({values}), "
+            "s AS (SELECT g, count(*) AS n, avg(v) AS mean, stddev_pop(v) AS std, min(v) AS low, max(v) AS high, "
+            "quantile_cont(v, [0.25, 0.5, 0.75]) AS q FROM v GROUP BY g), "
+            "f AS (SELECT *, q[1] - 1.5 * (q[3] - q[1]) AS lower, q[3] + 1.5 * (q[3] - q[1]) AS upper FROM s) "
+            "SELECT f.g, any_value(n), any_value(mean), any_value(std), any_value(low), any_value(high), any_value(q), "
+            "min(v) FILTER (WHERE v >= lower AND v <= upper), max(v) FILTER (WHERE v >= lower AND v <= upper), "
+            "count(DISTINCT v) FILTER (WHERE v < lower OR v > upper) "
+            "FROM v JOIN f ON v.g IS NOT DISTINCT FROM f.g GROUP BY f.g ORDER BY f.g",
+            params,
+        ).fetchall()
+        stats = []
+        for group, n, mean, std, low, high, (q1, median, q3), lowerfence, upperfence, n_outliers in rows:
+            stats.append((group, {
+                "count": n, "mean": mean, "q1": q1, "median": median, "q3": q3,
+                "lowerfence": lowerfence, "upperfence": upperfence, "outliers": np.array([], dtype="float64"),
+                "std": std, "min": low, "max": high, "n_outliers": n_outliers,
+            }))
+        return stats
+
+    def box_stats(self, column, by=None, filters=None, max_outliers=MAX_OUTLIER_POINTS):
+        stats = self._group_stats(column, by, filters)
+        wanted = {
+            group: thin_positions(summary["n_outliers"], max_outliers)
+            for group, summary in stats if summary["n_outliers"] and max_outliers
+        }
+        if wanted:
+            # Chỉ lấy các outlier khác nhau sẽ được vẽ (rải đều như box_summary), không kéo cả cột về
+            values, params = self._group_values(column, by, filters)
+            outside = " OR ".join("(g IS NOT DISTINCT FROM ? AND (v < ? OR v > ?))" for _ in wanted)
+            keep = " OR ".join(f"(g IS NOT DISTINCT FROM ? AND i IN ({', '.join(map(str, positions))}))" for positions in wanted.values())
+            fences = {group: summary for group, summary in stats}
+            outside_params = [p for group in wanted for p in (group, *_fences(fences[group]))]
+            found = {}
+            for group, value in self._query(
+                f"SELECT g, v FROM (SELECT g, v, row_number() OVER (PARTITION BY g ORDER BY v) - 1 AS i "
+                f"FROM (SELECT DISTINCT g, v FROM ({values}) WHERE {outside})) WHERE {keep} ORDER BY g, v",
+                [*params, *outside_params, *wanted],
+            ).fetchall():
+                found.setdefault(group, []).append(value)
+            for group, summary in stats:
+                summary["outliers"] = np.array(found.get(group, []), dtype="float64")
+        return [(group, _box_fields(summary)) for group, summary in stats]
+
+    def violin_stats(self, column, by=None, filters=None):
+        stats = self._group_stats(column, by, filters)
+        ranges = {}
+        for group, summary in stats:
+            bandwidth = kde_bandwidth(summary["count"], summary["std"], summary["q3"] - summary["q1"])
+            ranges[group] = (bandwidth, *kde_range(summary["min"], summary["max"], bandwidth))
+        # Histogram mịn của từng nhóm trên lưới KDE của nhóm đó; chỉ số đếm theo bin về Python
+        values, params = self._group_values(column, by, filters)
+        groups = ", ".join("(CAST(? AS VARCHAR), CAST(? AS DOUBLE), CAST(? AS DOUBLE))" for _ in ranges)
+        group_params = [
+            p for group, (_, low, high) in ranges.items() for p in (group, low, KDE_HISTOGRAM_BINS / (high - low))
+        ]
+        counts = {group: np.zeros(KDE_HISTOGRAM_BINS) for group in ranges}
+        if ranges:
+            bucket = f"least(greatest(CAST(floor((v - r.low) * r.norm) AS BIGINT), 0), {KDE_HISTOGRAM_BINS - 1})"
+            for group, position, count in self._query(
+                f"SELECT v.g, {bucket} AS b, count(*) FROM ({values}) v "
+                f"JOIN (VALUES {groups}) r(g, low, norm) ON v.g IS NOT DISTINCT FROM r.g GROUP BY ALL",
+                [*params, *group_params],
+            ).fetchall():
+                counts[group][position] = count
+        result = []
+        for group, summary in stats:
+            bandwidth, low, high = ranges[group]
+            summary = _box_fields(summary)
+            summary["grid"], summary["density"] = kde_from_histogram(counts[group], low, high, summary["count"], bandwidth)
+            result.append((group, summary))
+        return result
+
+    def histogram(self, column, bins=HISTOGRAM_BINS, filters=None):
+        value = f"CAST({_quote(column)} AS DOUBLE)"
+        where, params = _where(filters)
+        where = _and(where, f"isfinite({value})")
+        low, high = self._query(f"SELECT min({value}), max({value}) FROM dataset{where}", params).fetchone()
+        if low is None:
+            return bin_edges(0, 1, bins), np.zeros(bins, dtype=np.int64)
+        edges = bin_edges(low, high, bins)
+        counts = np.zeros(bins, dtype=np.int64)
+        for position, count in self._query(
+            f"SELECT {_bin_sql(value, bins)} AS b, count(*) FROM dataset{where} GROUP BY b",
+            [edges[0], bins / (edges[-1] - edges[0]), *params],
+        ).fetchall():
+            counts[position] = count
+        return edges, counts
+
+    def density_grid(self, x, y, color_by, size_by, bins=DENSITY_BINS, filters=None):
+        # Đếm theo ô (màu, bin x, bin y) bằng GROUP BY; chỉ các ô khác rỗng về Python
+        x_value, y_value = f"CAST({_quote(x)} AS DOUBLE)", f"CAST({_quote(y)} AS DOUBLE)"
+        size_value = f"CAST({_quote(size_by)} AS DOUBLE)"
+        where, params = _where(filters)
+        where = _and(
+            where,
+            f"{_quote(color_by)} IS NOT NULL AND isfinite({x_value}) AND isfinite({y_value}) AND isfinite({size_value})",
+        )
+        # Thứ tự nhóm như category của PandasBackend (sắp xếp), để màu của từng nhóm giống nhau
+        groups = sorted(self.values(color_by))
+        shape = (len(groups), bins, bins)
+        counts, size_sums = np.zeros(shape, dtype=np.int64), np.zeros(shape)
+        x_low, x_high, y_low, y_high = self._query(
+            f"SELECT min({x_value}), max({x_value}), min({y_value}), max({y_value}) FROM dataset{where}", params
+        ).fetchone()
+        if x_low is None:
+            return {"groups": groups, "x_edges": bin_edges(0, 1, bins), "y_edges": bin_edges(0, 1, bins),
+                    "counts": counts, "size_sums": size_sums}
+        x_edges, y_edges = bin_edges(x_low, x_high, bins), bin_edges(y_low, y_high, bins)
+        codes = {group: code for code, group in enumerate(groups)}
+        for group, x_bin, y_bin, count, size_sum in self._query(
+            f"SELECT CAST({_quote(color_by)} AS VARCHAR), {_bin_sql(x_value, bins)}, {_bin_sql(y_value, bins)}, "
+            f"count(*), sum({size_value}) FROM dataset{where} GROUP BY ALL",
+            [x_edges[0], bins / (x_edges[-1] - x_edges[0]), y_edges[0], bins / (y_edges[-1] - y_edges[0]), *params],
+        ).fetchall():
+            counts[codes[group], x_bin, y_bin] = count
+            size_sums[codes[group], x_bin, y_bin] = size_sum
+        return {"groups": groups, "x_edges": x_edges, "y_edges": y_edges, "counts": counts, "size_sums": size_sums}
+
+    def sample(self, filters, columns, by, size=SAMPLE_SIZE):
+        # Mẫu phân tầng ngay trong DuckDB: mỗi nhóm giữ round(size * n_nhóm / n) dòng (ít nhất một),
+        # là các dòng có hash khoá dòng nhỏ nhất, nên lần nào cũng ra cùng một mẫu
+        where, params = _where(filters)
+        group = _quote(by)
+        counts = self._query(f"SELECT {group}, count(*) FROM dataset{where} GROUP BY 1", params).fetchall()
+        total = sum(count for _, count in counts)
+        if not total:
+            return self.select(filters, columns)[0]
+        takes = {value: min(count, max(1, round(size * count / total))) for value, count in counts}
+        # Lọc trước theo ngưỡng hash của từng nhóm (quét một lượt, không sort cả tập đã lọc), ngưỡng đủ rộng
+        # để gần như chắc chắn còn ít nhất `take` dòng; chỉ phần còn lại mới được xếp hạng
+        limits = {
+            value: min(1.0, (take + 6 * math.sqrt(take) + 10) / count)
+            for (value, count), take in zip(counts, takes.values())
+        }
+        by_group = "CASE " + " ".join("WHEN __group IS NOT DISTINCT FROM ? THEN ?" for _ in counts) + " END"
+        selected = ", ".join(map(_quote, columns))
+        data = self._query(
+            f"SELECT {selected} FROM (SELECT {selected}, {group} AS __group, {self._row_key} AS __row, "
+            f"hash({self._row_key}) AS __hash FROM dataset{where}) WHERE __hash <= {by_group} "
+            f"QUALIFY row_number() OVER (PARTITION BY __group ORDER BY __hash) <= {by_group} ORDER BY __row",
+            [
+                *params,
+                *(p for value, limit in limits.items() for p in (value, int(limit * HASH_MAX))),
+                *(p for value, take in takes.items() for p in (value, take)),
+            ],
+        ).df()
+        return apply_schema(data)
+
+    def select(self, filters=None, columns=None):
+        where, params = _where(filters)
+        data = apply_schema(self._query(
+            f"SELECT {', '.join(map(_quote, columns or self._columns))} FROM dataset{where}", params
+        ).df())
+        return data, np.arange(len(data))
+
+    def batches(self, filters=None, columns=None, chunk_size=CHUNK_SIZE):
+        where, params = _where(filters)
+        return self._query(
+            f"SELECT {', '.join(map(_quote, columns or self._columns))} FROM dataset{where}", params
+        ).fetch_record_batch(chunk_size)
+
+
+def _fences(summary):
+    iqr = summary["q3"] - summary["q1"]
+    return summary["q1"] - 1.5 * iqr, summary["q3"] + 1.5 * iqr
+
+
+def _box_fields(summary):
+    # Chỉ giữ các khoá của utils.distributions.box_summary
+    return {key: summary[key] for key in ("count", "mean", "q1", "median", "q3", "lowerfence", "upperfence", "outliers")}
+
+
+BACKENDS = {"pandas": PandasBackend, "duckdb": DuckDBBackend}
+
+
+@st.cache_resource(show_spinner="Preparing query backend...", max_entries=2)
+def _backend(name, path, version):
+    return BACKENDS[name](path, version)
+
+
+def get_backend(path=DATA_PATH, name=BACKEND):
+    return _backend(name, path, get_data_version(path))
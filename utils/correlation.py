@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+CORRELATION_COLUMNS = ["Age", "Purchase Amount (USD)", "Review Rating", "Previous Purchases"]
+
+
+def moments(values):
+    # Thống kê đủ cho Pearson theo từng cặp cột (bỏ các dòng thiếu theo cặp như pandas)
+    valid = ~np.isnan(values)
+    present = valid.astype("float64")
+    filled = np.where(valid, values, 0.0)
+    return {
+        "n": present.T @ present,
+        "sum": filled.T @ present,
+        "sumsq": (filled * filled).T @ present,
+        "cross": filled.T @ filled,
+    }
+
+
+def _pearson(n, sums, sumsq, cross):
+    # sums[i, j] là tổng cột i trên các dòng mà cả i và j đều có giá trị
+    covariance = n * cross - sums * sums.T
+    variance = n * sumsq - sums ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = covariance / np.sqrt(variance * variance.T)
+    np.fill_diagonal(result, 1.0)
+    return np.clip(result, -1.0, 1.0)
+
+
+class CorrelationStats:
+    # Thống kê đủ của Pearson và Spearman cho các cột số, dựng một lần cho mỗi phiên bản dữ liệu;
+    # mọi tập cột sau đó tính trong O(k²). Spearman = Pearson trên hạng trung bình của cả cột
+
+    def __init__(self, data, columns=CORRELATION_COLUMNS):
+        self.columns = list(columns)
+        self.moments = {
+            "pearson": moments(data[self.columns].to_numpy(dtype="float64")),
+            "spearman": moments(data[self.columns].rank().to_numpy(dtype="float64")),
+        }
+
+    def matrix(self, columns, method="pearson"):
+        positions = [self.columns.index(column) for column in columns]
+        subset = np.ix_(positions, positions)
+        stats = self.moments[method]
+        result = _pearson(stats["n"][subset], stats["sum"][subset], stats["sumsq"][subset], stats["cross"][subset])
+        return pd.DataFrame(result, index=columns, columns=columns)
+
+
+def cube_matrix(totals, columns):
+    # Pearson cho một tập đã lọc, từ kết quả rollup(cube); cube không bỏ dòng thiếu theo cặp
+    # nên kết quả chỉ khớp DataFrame.corr() khi các cột không có giá trị thiếu
+    k = len(columns)
+    n = np.full((k, k), float(totals[("Rows", "count")]))
+    sums = np.empty((k, k))
+    sumsq = np.empty((k, k))
+    cross = np.empty((k, k))
+    for i, first in enumerate(columns):
+        sums[i, :] = totals[(first, "sum")]
+        sumsq[i, :] = totals[(first, "sumsq")]
+        for j, second in enumerate(columns):
+            if i == j:
+                cross[i, j] = totals[(first, "sumsq")]
+            elif (f"{first}*{second}", "sum") in totals.index:
+                cross[i, j] = totals[(f"{first}*{second}", "sum")]
+            else:
+                cross[i, j] = totals[(f"{second}*{first}", "sum")]
+    return pd.DataFrame(_pearson(n, sums, sumsq, cross), index=columns, columns=columns)
+
+
+def strongest_correlations(matrix, top=3):
+    upper_i, upper_j = np.triu_indices(len(matrix.columns), k=1)
+    values = matrix.to_numpy()[upper_i, upper_j]
+    order = np.argsort(-np.abs(values), kind="stable")[:top]
+    names = matrix.columns.to_numpy()
+    return pd.DataFrame({
+        "Variables": [f"{names[i]} ↔ {names[j]}" for i, j in zip(upper_i[order], upper_j[order])],
+        "Correlation": [f"{value:.3f}" for value in values[order]],
+    })
@@ -0,0 +1,93 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# Chiều của cube; Age được chia bucket 1 năm nên bộ lọc Age của slider vẫn chính xác
+DIMENSIONS = ["Category", "Gender", "Season", "Age"]
+MEASURES = ["Purchase Amount (USD)", "Review Rating", "Previous Purchases", "Age"]
+AGE_BUCKET_WIDTH = 1
+# Tổng tích chéo từng cặp measure: cùng sum/sumsq là đủ để tính Pearson cho tập đã lọc
+CROSS_PAIRS = list(combinations(MEASURES, 2))
+
+# Cách gộp từng thống kê khi roll-up nhiều ô của cube
+_COMBINE = {"sum": "sum", "count": "sum", "sumsq": "sum", "min": "min", "max": "max"}
+ROWS = "Rows"
+
+
+def build_cube(data):
+    frame = {dimension: data[dimension] for dimension in DIMENSIONS}
+    frame["Age"] = data["Age"] // AGE_BUCKET_WIDTH * AGE_BUCKET_WIDTH
+    for measure in MEASURES:
+        values = data[measure]
+        if pd.api.types.is_float_dtype(values):
+            values = values.astype("float64")
+        # Age vừa là chiều vừa là measure nên cột giá trị mang hậu tố riêng
+        frame[f"{measure}:value"] = values
+        frame[f"{measure}:sq"] = values.astype("float64") ** 2
+    for first, second in CROSS_PAIRS:
+        frame[f"{first}*{second}:cross"] = data[first].astype("float64") * data[second].astype("float64")
+    frame = pd.DataFrame(frame)
+
+    aggregations = {f"{ROWS}:count": (f"{MEASURES[0]}:value", "size")}
+    for measure in MEASURES:
+        aggregations[f"{measure}:sum"] = (f"{measure}:value", "sum")
+        aggregations[f"{measure}:count"] = (f"{measure}:value", "count")
+        aggregations[f"{measure}:sumsq"] = (f"{measure}:sq", "sum")
+        aggregations[f"{measure}:min"] = (f"{measure}:value", "min")
+        aggregations[f"{measure}:max"] = (f"{measure}:value", "max")
+    for first, second in CROSS_PAIRS:
+        aggregations[f"{first}*{second}:sum"] = (f"{first}*{second}:cross", "sum")
+    return frame.groupby(DIMENSIONS, observed=True).agg(**aggregations).reset_index()
+
+
+def append_cube(cube, data):
+    # Cộng dồn các ô của dòng mới vào cube hiện có thay vì dựng lại từ đầu
+    cells = pd.concat([cube, build_cube(data)], ignore_index=True)
+    combine = {column: _COMBINE[column.rsplit(":", 1)[1]] for column in cube.columns if ":" in column}
+    for dimension in DIMENSIONS:
+        # concat hai categorical khác nhau cho ra cột chuỗi, đưa lại về category
+        if isinstance(cube[dimension].dtype, pd.CategoricalDtype) and not isinstance(cells[dimension].dtype, pd.CategoricalDtype):
+            cells[dimension] = cells[dimension].astype("category")
+    return cells.groupby(DIMENSIONS, observed=True).agg(combine).reset_index()
+
+
+def _filter_cells(cube, filters):
+    mask = np.ones(len(cube), dtype=bool)
+    for column, condition in (filters or {}).items():
+        if column == "Age":
+            low, high = condition
+            mask &= cube["Age"].between(low, high).to_numpy()
+        else:
+            values = [condition] if isinstance(condition, str) or not np.iterable(condition) else condition
+            mask &= cube[column].isin(values).to_numpy()
+    return cube[mask]
+
+
+def _finalize(cells):
+    result = {(ROWS, "count"): cells[f"{ROWS}:count"]}
+    for measure in MEASURES:
+        total = cells[f"{measure}:sum"]
+        count = cells[f"{measure}:count"]
+        variance = (cells[f"{measure}:sumsq"] - total.astype("float64") ** 2 / count) / (count - 1)
+        result[(measure, "sum")] = total
+        result[(measure, "count")] = count
+        result[(measure, "mean")] = total / count
+        result[(measure, "std")] = np.sqrt(variance.clip(lower=0)).where(count > 1)
+        result[(measure, "min")] = cells[f"{measure}:min"]
+        result[(measure, "max")] = cells[f"{measure}:max"]
+        result[(measure, "sumsq")] = cells[f"{measure}:sumsq"]
+    for first, second in CROSS_PAIRS:
+        result[(f"{first}*{second}", "sum")] = cells[f"{first}*{second}:sum"]
+    return pd.DataFrame(result)
+
+
+def rollup(cube, by=None, filters=None):
+    # Gộp các ô khớp bộ lọc theo chiều by: cột (measure, sum/count/mean/std/min/max/sumsq),
+    # ("a*b", "sum") và ("Rows", "count"); by=None trả về Series tổng
+    cells = _filter_cells(cube, filters)
+    combine = {column: _COMBINE[column.rsplit(":", 1)[1]] for column in cube.columns if ":" in column}
+    if by is None:
+        totals = pd.DataFrame({column: [cells[column].agg(how)] for column, how in combine.items()})
+        return _finalize(totals).iloc[0]
+    return _finalize(cells.groupby(by, observed=True).agg(combine))
@@ -0,0 +1,322 @@
+import hashlib
+import os
+import re
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from utils.correlation import CorrelationStats
+from utils.cube import build_cube
+from utils.filter_index import FilterIndex
+from utils.ingest import CHUNK_SIZE, iter_parquet_batches, read_partitioned
+from utils.manifest import MANIFEST_NAME, ManifestBuilder, read_manifest, write_manifest
+from utils.schema import apply_schema, memory_report
+from utils.segments import SegmentTable
+from utils.shared_store import iter_arrow_batches, map_arrow, write_arrow
+from utils.sketch import QuantileSketches
+
+# xlsx, CSV, Parquet hoặc thư mục Parquet đã partition (xem utils/ingest.py)
+DATA_PATH = os.environ.get("SHOPPING_DATA_PATH", "data/shopping_trends.xlsx")
+CACHE_DIR = "data/.cache"
+# Tăng khi apply_schema hoặc nội dung manifest thay đổi để file cache cũ không còn được dùng
+SCHEMA_VERSION = 2
+
+# (path, mtime_ns, size) -> version, để không phải hash lại file ở mỗi rerun
+_versions = {}
+# path -> phiên bản do watcher (utils/refresh.py) công bố; session chỉ thấy dữ liệu mới khi nó đã sẵn sàng
+_published = {}
+# (path, version) -> {tên: đối tượng đã dựng}. Streamlit không cho đọc/ghi trực tiếp cache,
+# nên watcher dùng bảng này để lấy trạng thái cũ và nạp sẵn kết quả cập nhật theo delta
+_artifacts = {}
+MAX_ARTIFACT_VERSIONS = 2
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _directory_digest(path):
+    # Dataset partition: hash danh sách file + kích thước + mtime thay vì nội dung
+    digest = hashlib.sha1()
+    for root, _, files in sorted(os.walk(path)):
+        for name in sorted(files):
+            if name == MANIFEST_NAME:
+                # Manifest được sinh từ chính dữ liệu, không tính vào phiên bản
+                continue
+            stat = os.stat(os.path.join(root, name))
+            digest.update(f"{os.path.relpath(os.path.join(root, name), path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def is_parquet(path):
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def source_version(path):
+    # Phiên bản theo nội dung nguồn hiện tại trên đĩa
+    if os.path.isdir(path):
+        return _directory_digest(path)
+    # Chỉ hash lại nội dung khi mtime hoặc kích thước thay đổi
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _versions:
+        _versions[key] = _file_digest(path)
+    return _versions[key]
+
+
+def get_data_version(path=DATA_PATH):
+    return _published.get(path) or source_version(path)
+
+
+def publish_version(path, version, artifacts=None):
+    # Nạp sẵn artifacts trước rồi mới công bố, để rerun kế tiếp không phải dựng lại
+    if artifacts:
+        _artifacts.setdefault((path, version), {}).update(artifacts)
+    _published[path] = version
+    _reference_version(path, version)
+
+
+def _artifact(path, version, name, build):
+    artifacts = _artifacts.setdefault((path, version), {})
+    if name not in artifacts:
+        artifacts[name] = build()
+    while len(_artifacts) > MAX_ARTIFACT_VERSIONS:
+        _artifacts.pop(next(iter(_artifacts)))
+    return artifacts[name]
+
+
+def get_artifact(path, version, name):
+    return _artifacts.get((path, version), {}).get(name)
+
+
+def _cache_prefix(path, version):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{version}-s{SCHEMA_VERSION}")
+
+
+def _sidecar_path(path, version):
+    # Bản chuẩn của dataset: file Arrow IPC được mọi session và mọi process map chung
+    return f"{_cache_prefix(path, version)}.arrow"
+
+
+def parts_path(path, version):
+    # Bản Parquet đã partition của nguồn xlsx/CSV, do DuckDBBackend ingest một lần cho mỗi phiên bản
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}.parts-{version}-s{SCHEMA_VERSION}")
+
+
+def _reference_path(path, version, pid):
+    return f"{_cache_prefix(path, version)}.ref-{pid}"
+
+
+def _reference_version(path, version):
+    # Mỗi process đánh dấu phiên bản nó đang ghim; các process khác không xoá file cache của phiên bản đó
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for name in os.listdir(CACHE_DIR):
+            if not _cache_key(path, name) or ".ref-" not in name:
+                continue
+            pid = int(name.rsplit(".ref-", 1)[1])
+            # Bỏ tham chiếu cũ của chính process này và tham chiếu của các process đã thoát
+            if (pid == os.getpid() and name != os.path.basename(_reference_path(path, version, pid))) or not _process_alive(pid):
+                os.remove(os.path.join(CACHE_DIR, name))
+        open(_reference_path(path, version, os.getpid()), "a").close()
+    except OSError:
+        pass
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _cache_key(path, name):
+    # "<phiên bản>-s<schema>" của một mục trong CACHE_DIR (sidecar, manifest, tham chiếu, thư mục parts của DuckDB)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.fullmatch(rf"{re.escape(stem)}(?:-|\.parts-)([0-9a-f]+-s\d+)(?:\..*)?", name)
+    return match and match[1]
+
+
+def remove_stale_versions(path, keep_version):
+    # Xoá file cache của các phiên bản cũ của cùng nguồn, trừ phiên bản còn được một process đang chạy ghim:
+    # process đó có thể chưa map sidecar và sẽ phải đọc lại nguồn, lúc này đã là nội dung mới
+    entries = {}
+    for name in os.listdir(CACHE_DIR):
+        key = _cache_key(path, name)
+        if key and key != f"{keep_version}-s{SCHEMA_VERSION}":
+            entries.setdefault(key, []).append(name)
+    for names in entries.values():
+        pids = [int(name.rsplit(".ref-", 1)[1]) for name in names if ".ref-" in name]
+        if any(_process_alive(pid) for pid in pids):
+            continue
+        for name in names:
+            old_path = os.path.join(CACHE_DIR, name)
+            if os.path.isdir(old_path):
+                shutil.rmtree(old_path, ignore_errors=True)
+            elif os.path.exists(old_path):
+                os.remove(old_path)
+
+
+def _read_source(path):
+    if is_parquet(path):
+        return read_partitioned(path)
+    if path.endswith(".csv"):
+        return apply_schema(pd.read_csv(path))
+    return apply_schema(pd.read_excel(path))
+
+
+def _write_sidecar(data, path, version):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_arrow(data, _sidecar_path(path, version))
+    remove_stale_versions(path, version)
+
+
+@st.cache_resource(show_spinner="Loading dataset...", max_entries=2)
+def load_dataset(path, version):
+    return _artifact(path, version, "data", lambda: _build_dataset(path, version))
+
+
+def _build_dataset(path, version):
+    sidecar = _sidecar_path(path, version)
+    if not os.path.exists(sidecar):
+        if source_version(path) != version:
+            # Không dựng phiên bản cũ từ nội dung mới của nguồn: dữ liệu sẽ lệch với khoá cache mà không báo lỗi
+            raise RuntimeError(
+                f"{path} changed after version {version} was published; reload the page to use the new data."
+            )
+        # Process đầu tiên gặp phiên bản này đọc nguồn một lần rồi ghi file Arrow
+        data = _read_source(path)
+        try:
+            _write_sidecar(data, path, version)
+            # Manifest dựng luôn từ file Arrow vừa ghi, để sidebar không phải phân tích lại nguồn
+            if not os.path.exists(_manifest_path(path, version)):
+                _write_source_manifest(path, version, iter_arrow_batches(sidecar))
+        except OSError:
+            # Thư mục chỉ đọc: tiếp tục dùng frame trong bộ nhớ
+            return data
+    return map_arrow(sidecar)
+
+
+def load_data(path=DATA_PATH):
+    # Frame trả về được mọi session dùng chung, các trang không được sửa nó
+    return load_dataset(path, get_data_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def dataset_memory_report(path, version):
+    return memory_report(load_dataset(path, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def dataset_filter_index(path, version):
+    return _artifact(path, version, "index", lambda: FilterIndex(load_dataset(path, version)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def dataset_cube(path, version):
+    return _artifact(path, version, "cube", lambda: build_cube(load_dataset(path, version)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def dataset_correlation_stats(path, version):
+    return CorrelationStats(load_dataset(path, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def dataset_segments(path, version):
+    return SegmentTable(load_dataset(path, version))
+
+
+def _source_batches(path, version):
+    # Đọc nguồn theo từng batch, ưu tiên file Arrow đã map hoặc Parquet thay vì xlsx/CSV
+    sidecar = _sidecar_path(path, version)
+    if os.path.exists(sidecar):
+        return iter_arrow_batches(sidecar)
+    if is_parquet(path):
+        return iter_parquet_batches(path)
+    # xlsx/CSV chỉ được phân tích một lần, khi nạp dataset (lần đầu sẽ ghi file Arrow)
+    data = load_dataset(path, version)
+    if os.path.exists(sidecar):
+        return iter_arrow_batches(sidecar)
+    return pa.Table.from_pandas(data, preserve_index=False).to_batches(max_chunksize=CHUNK_SIZE)
+
+
+def _manifest_path(path, version):
+    if os.path.isdir(path):
+        return os.path.join(path, MANIFEST_NAME)
+    return f"{_cache_prefix(path, version)}.manifest.json"
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def dataset_manifest(path, version):
+    return _artifact(path, version, "manifest", lambda: _build_manifest(path, version))
+
+
+def _read_current_manifest(path, version):
+    manifest_path = _manifest_path(path, version)
+    if os.path.exists(manifest_path):
+        manifest = read_manifest(manifest_path)
+        if manifest.get("version") == version:
+            return manifest
+    return None
+
+
+def _build_manifest(path, version):
+    manifest = _read_current_manifest(path, version)
+    if manifest is None and not is_parquet(path):
+        # xlsx/CSV: nạp dataset, lần đầu nó ghi cả file Arrow lẫn manifest trong cùng một lần đọc nguồn
+        load_dataset(path, version)
+        manifest = _read_current_manifest(path, version)
+    if manifest is None:
+        # Chưa có (hoặc đã cũ): quét Parquet / file Arrow theo batch
+        manifest = _write_source_manifest(path, version, _source_batches(path, version))
+    return manifest
+
+
+def _write_source_manifest(path, version, batches):
+    builder = ManifestBuilder()
+    for batch in batches:
+        builder.update(batch)
+    manifest = builder.result(version)
+    manifest_path = _manifest_path(path, version)
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        write_manifest(manifest, manifest_path)
+        if not os.path.isdir(path):
+            remove_stale_versions(path, version)
+    except OSError:
+        pass
+    return manifest
+
+
+def get_manifest(path=DATA_PATH):
+    # Số dòng, số giá trị khác nhau/null, độ đầy đủ, min/max/mean của từng cột
+    return dataset_manifest(path, get_data_version(path))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _quantile_sketches(path, version):
+    return _artifact(path, version, "sketches", lambda: _build_sketches(path, version))
+
+
+def _build_sketches(path, version):
+    sketches = QuantileSketches()
+    for chunk in _source_batches(path, version):
+        sketches.update(chunk)
+    return sketches
+
+
+def get_quantile_sketches(path=DATA_PATH):
+    # KLL sketch cho từng cột số và từng nhóm Gender/Category/Season, quét nguồn một lần
+    return _quantile_sketches(path, get_data_version(path))
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+# Số điểm outlier tối đa gửi xuống trình duyệt cho mỗi nhóm
+MAX_OUTLIER_POINTS = 200
+KDE_GRID_POINTS = 100
+KDE_HISTOGRAM_BINS = 512
+HISTOGRAM_BINS = 30
+DENSITY_BINS = 60
+SAMPLE_SIZE = 20_000
+
+
+def group_codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series.cat.codes.to_numpy(), list(series.cat.categories)
+
+
+def group_rows(data, rows, column):
+    # [(nhóm, vị trí các dòng của nhóm)] theo thứ tự category, bỏ nhóm rỗng; column=None là một nhóm
+    if column is None:
+        return [(None, rows)]
+    codes, groups = group_codes(data[column])
+    codes = codes[rows]
+    return [(group, rows[codes == code]) for code, group in enumerate(groups) if (codes == code).any()]
+
+
+def thin_positions(count, limit):
+    # Giữ hai đầu và rải đều phần còn lại khi có quá `limit` phần tử
+    if count <= limit:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, limit).round().astype(int))
+
+
+def box_summary(values, max_outliers=MAX_OUTLIER_POINTS):
+    values = values[~np.isnan(values)]
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = np.unique(values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)])
+    return {
+        "count": len(values),
+        "mean": values.mean(),
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": inside.min(),
+        "upperfence": inside.max(),
+        "outliers": outliers[thin_positions(len(outliers), max_outliers)],
+    }
+
+
+def bin_edges(low, high, bins):
+    low, high = float(low), float(high)
+    if high == low:
+        high = low + 1
+    return np.linspace(low, high, bins + 1)
+
+
+def bin_index(values, low, high, bins):
+    # Chỉ số bin đều trên [low, high], bin cuối gồm cả high. DuckDBBackend dùng đúng công thức này
+    # trong SQL nên hai backend xếp mọi giá trị vào cùng một bin
+    return np.clip(np.floor((values - low) * (bins / (high - low))), 0, bins - 1).astype(np.int64)
+
+
+def kde_bandwidth(count, std, iqr):
+    # Quy tắc Silverman
+    spread = min(std, iqr / 1.34) if iqr > 0 else std
+    return 1.06 * spread * count ** -0.2 if spread > 0 else 1.0
+
+
+def kde_range(low, high, bandwidth):
+    # Khoảng của lưới KDE, cũng là khoảng của histogram mịn dùng để tính nó
+    return low - 2 * bandwidth, high + 2 * bandwidth
+
+
+def kde_from_histogram(counts, low, high, count, bandwidth, points=KDE_GRID_POINTS):
+    # KDE Gaussian trên histogram mịn: O(bins * points), không phụ thuộc số dòng
+    grid = np.linspace(low, high, points)
+    edges = np.linspace(low, high, len(counts) + 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    weights = np.exp(-0.5 * ((grid[:, None] - centers[None, :]) / bandwidth) ** 2)
+    density = weights @ counts / (count * bandwidth * np.sqrt(2 * np.pi))
+    return grid, density
+
+
+def violin_summary(values):
+    # Box (không kèm outlier) và đường KDE của một nhóm
+    values = values[~np.isnan(values)]
+    stats = box_summary(values, max_outliers=0)
+    bandwidth = kde_bandwidth(len(values), values.std(), stats["q3"] - stats["q1"])
+    low, high = kde_range(values.min(), values.max(), bandwidth)
+    counts = np.bincount(bin_index(values, low, high, KDE_HISTOGRAM_BINS), minlength=KDE_HISTOGRAM_BINS)
+    stats["grid"], stats["density"] = kde_from_histogram(counts, low, high, len(values), bandwidth)
+    return stats
+
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return bin_edges(0, 1, bins), np.zeros(bins, dtype=np.int64)
+    edges = bin_edges(values.min(), values.max(), bins)
+    return edges, np.bincount(bin_index(values, edges[0], edges[-1], bins), minlength=bins)
+
+
+def density_grid(data, rows, x, y, color_by, size_by, bins=DENSITY_BINS):
+    # Số dòng và tổng size_by trên lưới bins x bins cho từng nhóm color_by: dict gồm groups, x_edges,
+    # y_edges và counts/size_sums dạng (len(groups), bins, bins); bỏ các dòng thiếu một trong bốn giá trị
+    x_values = data[x].to_numpy()[rows].astype("float64")
+    y_values = data[y].to_numpy()[rows].astype("float64")
+    weights = data[size_by].to_numpy()[rows].astype("float64")
+    codes, groups = group_codes(data[color_by])
+    codes = codes[rows]
+
+    valid = (codes >= 0) & np.isfinite(x_values) & np.isfinite(y_values) & np.isfinite(weights)
+    if not valid.all():
+        x_values, y_values, weights, codes = x_values[valid], y_values[valid], weights[valid], codes[valid]
+
+    n_cells = len(groups) * bins * bins
+    if len(codes) == 0:
+        empty = np.zeros((len(groups), bins, bins))
+        return {"groups": groups, "x_edges": bin_edges(0, 1, bins), "y_edges": bin_edges(0, 1, bins),
+                "counts": empty.astype(np.int64), "size_sums": empty}
+    x_edges = bin_edges(x_values.min(), x_values.max(), bins)
+    y_edges = bin_edges(y_values.min(), y_values.max(), bins)
+    x_bin = bin_index(x_values, x_edges[0], x_edges[-1], bins)
+    y_bin = bin_index(y_values, y_edges[0], y_edges[-1], bins)
+    cell = (codes.astype("int64") * bins + x_bin) * bins + y_bin
+    return {
+        "groups": groups,
+        "x_edges": x_edges,
+        "y_edges": y_edges,
+        "counts": np.bincount(cell, minlength=n_cells).reshape(len(groups), bins, bins),
+        "size_sums": np.bincount(cell, weights=weights, minlength=n_cells).reshape(len(groups), bins, bins),
+    }
+
+
+def stratified_sample(data, rows, by, size=SAMPLE_SIZE, seed=0):
+    # Lấy mẫu theo tỉ lệ từng nhóm của `by`, mỗi nhóm có ít nhất một điểm
+    if len(rows) <= size:
+        return rows
+    rng = np.random.default_rng(seed)
+    codes, _ = group_codes(data[by])
+    codes = codes[rows]
+    sampled = []
+    for code in np.unique(codes):
+        members = rows[codes == code]
+        take = max(1, round(size * len(members) / len(rows)))
+        sampled.append(rng.choice(members, size=min(take, len(members)), replace=False))
+    return np.sort(np.concatenate(sampled))
@@ -0,0 +1,156 @@
+import os
+import secrets
+import shutil
+import time
+
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils.ingest import CHUNK_SIZE
+from utils.perf import span
+
+# File export được ghi vào thư mục static của app và Streamlit phục vụ trực tiếp từ đĩa
+# (server.enableStaticServing trong .streamlit/config.toml), không đi qua bộ nhớ của server.
+# Ai có link đều tải được (không cần đăng nhập, Access-Control-Allow-Origin: *), nên mỗi export
+# nằm trong một thư mục tên ngẫu nhiên và bị xoá sau EXPORT_TTL
+STATIC_DIR = "static"
+EXPORT_DIR = os.path.join(STATIC_DIR, "exports")
+STATIC_URL = "app/static"
+# Streamlit không phục vụ file static lớn hơn 200 MB: export lớn hơn được chia thành nhiều phần
+MAX_EXPORT_BYTES = 200 * 1024**2
+# Chừa chỗ cho batch cuối và footer Parquet
+PART_BYTES = MAX_EXPORT_BYTES * 9 // 10
+# Thư mục export cũ hơn thời gian này (giây) bị xoá ở lần hiển thị export kế tiếp
+EXPORT_TTL = 3600
+# Định dạng -> (đuôi file, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _open_writer(sink, fmt, schema):
+    if fmt == "CSV":
+        return pcsv.CSVWriter(sink, schema)
+    return pq.ParquetWriter(sink, schema)
+
+
+def _remove_old_exports():
+    # Session kết thúc không báo lại, nên dọn các thư mục export đã quá hạn
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - EXPORT_TTL
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+        except OSError:
+            pass
+
+
+def _discard(export):
+    shutil.rmtree(export["dir"], ignore_errors=True)
+
+
+def _export_url(path):
+    return f"{STATIC_URL}/{os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')}"
+
+
+def _part_path(directory, number, extension):
+    return os.path.join(directory, f"shopping_trends-part-{number:03d}.{extension}")
+
+
+def export_filtered(backend, filters, fmt, columns=None, chunk_size=CHUNK_SIZE, progress=None, part_bytes=PART_BYTES):
+    # Ghi các dòng thoả bộ lọc vào một thư mục mới dưới EXPORT_DIR, trả về (thư mục, [các phần]).
+    # Đọc từ backend.batches từng chunk_size dòng nên bộ nhớ chỉ cỡ một chunk; khi phần hiện tại
+    # sắp vượt part_bytes thì đóng lại và mở phần mới. progress(written, total) sau mỗi chunk
+    total = backend.count(filters)
+    extension = EXPORT_FORMATS[fmt][0]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    _remove_old_exports()
+    directory = os.path.join(EXPORT_DIR, secrets.token_urlsafe(16))
+    os.makedirs(directory)
+    paths = []
+    sink = writer = None
+    try:
+        reader = backend.batches(filters, columns, chunk_size)
+        written = 0
+        largest = 0
+        for batch in reader:
+            if writer is not None and sink.tell() + largest > part_bytes:
+                writer.close()
+                sink.close()
+                writer = None
+            if writer is None:
+                paths.append(_part_path(directory, len(paths) + 1, extension))
+                sink = pa.OSFile(paths[-1], "wb")
+                writer = _open_writer(sink, fmt, reader.schema)
+            before = sink.tell()
+            writer.write_batch(batch)
+            largest = max(largest, sink.tell() - before)
+            written += batch.num_rows
+            if progress is not None:
+                progress(written, total)
+        if writer is None:
+            # Không có dòng nào: vẫn trả về một file chỉ có header/schema
+            paths.append(_part_path(directory, 1, extension))
+            sink = pa.OSFile(paths[-1], "wb")
+            writer = _open_writer(sink, fmt, reader.schema)
+        writer.close()
+        sink.close()
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    return directory, paths
+
+
+@st.fragment
+def show_export(backend, filters, columns=None, key="export"):
+    # Ghi ra file theo chunk rồi mới tạo link tải, không dựng chuỗi CSV của cả tập đã lọc
+    _remove_old_exports()
+    if not st.get_option("server.enableStaticServing"):
+        st.warning("Downloads need static file serving: set `server.enableStaticServing = true` in .streamlit/config.toml.")
+        return
+    fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_format")
+    request = (fmt, repr(sorted(filters.items())), tuple(columns or ()))
+    export = st.session_state.get(key)
+    if export is not None and (export["request"] != request or not all(map(os.path.exists, export["paths"]))):
+        # Bộ lọc, cột hoặc định dạng đã đổi (hoặc file đã bị dọn): file cũ không còn dùng được
+        _discard(export)
+        del st.session_state[key]
+        export = None
+
+    if export is None:
+        if not st.button("Prepare export", key=f"{key}_prepare"):
+            return
+        total = backend.count(filters)
+        bar = st.progress(0.0, text=f"Exporting {total:,} rows...") if total > CHUNK_SIZE else None
+
+        def progress(written, total):
+            bar.progress(written / total, text=f"Exported {written:,} of {total:,} rows")
+
+        with span("export"):
+            directory, paths = export_filtered(backend, filters, fmt, columns, progress=progress if bar else None)
+        export = st.session_state[key] = {"request": request, "dir": directory, "paths": paths, "rows": total}
+
+    extension, mime = EXPORT_FORMATS[fmt]
+    paths = export["paths"]
+    if len(paths) > 1:
+        st.caption(
+            f"{export['rows']:,} rows split into {len(paths)} files of up to {PART_BYTES / 1024**2:.0f} MB "
+            "(Streamlit serves static files up to 200 MB). Each file has its own header."
+        )
+    # Trình duyệt tải file thẳng từ đĩa qua static serving, server không đọc nội dung vào RAM
+    links = []
+    for number, path in enumerate(paths, start=1):
+        size = os.path.getsize(path) / 1024**2
+        if len(paths) == 1:
+            name, label = f"shopping_trends.{extension}", f"Download {export['rows']:,} rows ({size:.1f} MB)"
+        else:
+            name, label = os.path.basename(path), f"Part {number} of {len(paths)} ({size:.1f} MB)"
+        links.append(f'<a href="{_export_url(path)}" download="{name}" type="{mime}">⬇️ {label}</a>')
+    st.markdown("<br>".join(links), unsafe_allow_html=True)
+    st.caption(f"Links stay valid for {EXPORT_TTL // 60} minutes and work for anyone who has them.")
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.io as pio
+import streamlit as st
+
+from utils.perf import span
+
+FIGURE_CACHE_SIZE = 128
+# Tổng kích thước JSON tối đa của các figure trong cache (một scatter 100k điểm khoảng 4 MB)
+FIGURE_CACHE_BYTES = 64 * 1024**2
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _figure_bytes(figure):
+    # Kích thước JSON mà st.plotly_chart sẽ gửi, chỉ tính một lần lúc dựng figure
+    return len(pio.to_json(figure, validate=False))
+
+
+def figure_key(name, version, filters=None, **params):
+    # Khoá gồm phiên bản dữ liệu, bộ lọc và các tuỳ chọn của biểu đồ
+    return (name, version, _freeze(filters or {}), _freeze(params))
+
+
+class FigureCache:
+    # Cache LRU các figure Plotly đã dựng, dùng chung cho mọi session trong process;
+    # giới hạn theo số mục và theo tổng kích thước JSON của các figure
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Dựng figure ngoài lock để các session khác không phải chờ
+        with span(f"figure:{key[0]}"):
+            figure = build()
+            size = _figure_bytes(figure)
+        if size > self.max_bytes:
+            # Một figure lớn hơn cả ngân sách thì không cache
+            return figure
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (figure, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return figure
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+def show_figure_cache_stats():
+    stats = get_figure_cache().stats()
+    with st.sidebar.expander("🗂️ Figure Cache"):
+        col1, col2 = st.columns(2)
+        col1.metric("Hits", stats["hits"])
+        col2.metric("Misses", stats["misses"])
+        st.caption(
+            f"{stats['entries']}/{stats['max_entries']} entries · "
+            f"{stats['bytes'] / 1024**2:.1f}/{stats['max_bytes'] / 1024**2:.0f} MB · "
+            f"{stats['evictions']} evicted · hit rate {stats['hit_rate']:.0%}"
+        )
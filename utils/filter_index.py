@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# Các cột lọc theo giá trị trên các trang; cột phân loại khác chỉ dựng bitmap khi lần đầu được lọc
+FILTER_COLUMNS = ["Gender", "Category", "Season"]
+# Các cột lọc theo khoảng (slider)
+RANGE_COLUMNS = ["Age"]
+
+# Số bit 1 trong mỗi byte, dùng để đếm nhanh trên bitmap đã pack
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _append_bits(packed, n_rows, bits):
+    # Nối thêm bit vào bitmap đã pack mà chỉ unpack byte cuối còn dở
+    whole = n_rows // 8
+    tail = np.unpackbits(packed[whole:], count=n_rows - whole * 8)
+    return np.concatenate([packed[:whole], np.packbits(np.concatenate([tail, bits]))])
+
+
+def _codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series.cat.codes.to_numpy(), series.cat.categories
+
+
+def _row_dtype(n_rows):
+    # Vị trí dòng int32 khi đủ chỗ: index theo khoảng chỉ tốn một nửa bộ nhớ
+    return np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+
+
+class FilterIndex:
+    # Bitmap đã pack cho từng giá trị cột lọc + chỉ mục sắp xếp cho cột khoảng.
+    # Bộ lọc: {"Gender": "Male", "Category": ["Clothing"], "Age": (18, 40)}; khoảng gồm cả hai đầu
+
+    def __init__(self, data, columns=None, range_columns=None):
+        columns = columns or [c for c in FILTER_COLUMNS if c in data.columns]
+        range_columns = range_columns or [c for c in RANGE_COLUMNS if c in data.columns]
+
+        self.n_rows = len(data)
+        self.bitmaps = {column: self._build_bitmaps(data[column]) for column in columns}
+
+        self.sorted_rows = {}
+        self.sorted_values = {}
+        for column in range_columns:
+            values = data[column].to_numpy()
+            order = np.argsort(values, kind="stable").astype(_row_dtype(self.n_rows))
+            self.sorted_rows[column] = order
+            self.sorted_values[column] = values[order]
+
+        self._orders = {}
+        self._data = data
+
+        self._empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        self._full = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    @staticmethod
+    def _build_bitmaps(series):
+        codes, categories = _codes(series)
+        return {value: np.packbits(codes == code) for code, value in enumerate(categories)}
+
+    def appended(self, data):
+        # Index cho data = các dòng đã index + dòng mới: chỉ quét dòng mới, nối thêm bit vào bitmap
+        # thay vì dựng lại và trộn dòng mới vào chỉ mục sắp xếp
+        new_rows = data.iloc[self.n_rows:]
+        index = FilterIndex.__new__(FilterIndex)
+        index.n_rows = len(data)
+        index.bitmaps = {}
+        for column, bitmaps in list(self.bitmaps.items()):
+            codes, categories = _codes(new_rows[column])
+            new_bits = {value: codes == code for code, value in enumerate(categories)}
+            no_bits = np.zeros(len(new_rows), dtype=bool)
+            index.bitmaps[column] = {
+                value: _append_bits(bitmaps.get(value, self._empty), self.n_rows, new_bits.get(value, no_bits))
+                for value in list(bitmaps) + [value for value in new_bits if value not in bitmaps]
+            }
+
+        index.sorted_rows = {}
+        index.sorted_values = {}
+        for column in self.sorted_rows:
+            values = new_rows[column].to_numpy()
+            order = np.argsort(values, kind="stable")
+            # side="right": giá trị bằng nhau thì dòng cũ đứng trước, giống argsort ổn định
+            positions = np.searchsorted(self.sorted_values[column], values[order], side="right")
+            rows = np.insert(self.sorted_rows[column], positions, order + self.n_rows)
+            index.sorted_rows[column] = rows.astype(_row_dtype(index.n_rows), copy=False)
+            index.sorted_values[column] = np.insert(self.sorted_values[column], positions, values[order])
+
+        index._orders = {}
+        index._data = data
+        index._empty = np.zeros((index.n_rows + 7) // 8, dtype=np.uint8)
+        index._full = np.packbits(np.ones(index.n_rows, dtype=bool))
+        return index
+
+    def order(self, column):
+        # Thứ tự sắp xếp ổn định của cả cột, tính lần đầu cần rồi giữ lại
+        if column not in self._orders:
+            if column in self.sorted_rows:
+                self._orders[column] = self.sorted_rows[column]
+            else:
+                series = self._data[column]
+                keys = series.cat.codes if isinstance(series.dtype, pd.CategoricalDtype) else series
+                self._orders[column] = np.argsort(keys.to_numpy(), kind="stable")
+        return self._orders[column]
+
+    def column_bitmaps(self, column):
+        # Cột ngoài FILTER_COLUMNS: dựng bitmap ở lần lọc đầu tiên rồi giữ lại
+        if column not in self.bitmaps:
+            self.bitmaps[column] = self._build_bitmaps(self._data[column])
+        return self.bitmaps[column]
+
+    def values(self, column):
+        return list(self.column_bitmaps(column))
+
+    def _value_bitmap(self, column, values):
+        if isinstance(values, str) or not np.iterable(values):
+            values = [values]
+        bitmaps = self.column_bitmaps(column)
+        if len(values) == len(bitmaps) and all(value in bitmaps for value in values):
+            return None
+        result = self._empty.copy()
+        for value in values:
+            if value in bitmaps:
+                np.bitwise_or(result, bitmaps[value], out=result)
+        return result
+
+    def _range_bitmap(self, column, bounds):
+        low, high = bounds
+        values = self.sorted_values[column]
+        if self.n_rows == 0 or (low <= values[0] and high >= values[-1]):
+            return None
+        start = np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, high, side="right")
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.sorted_rows[column][start:stop]] = True
+        return np.packbits(mask)
+
+    def bitmap(self, filters):
+        result = None
+        for column, condition in filters.items():
+            if column in self.sorted_rows:
+                part = self._range_bitmap(column, condition)
+            else:
+                part = self._value_bitmap(column, condition)
+            if part is None:
+                continue
+            if result is None:
+                result = part.copy()
+            else:
+                np.bitwise_and(result, part, out=result)
+        return self._full if result is None else result
+
+    def select(self, filters):
+        # Vị trí các dòng thoả mãn bộ lọc, dùng với data.iloc / data.take
+        bitmap = self.bitmap(filters)
+        if bitmap is self._full:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def count(self, filters):
+        bitmap = self.bitmap(filters)
+        if bitmap is self._full:
+            return self.n_rows
+        return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def ordered_select(self, filters, column, ascending=True):
+        # Các dòng thoả mãn bộ lọc theo thứ tự của column, không cần sort lại
+        order = self.order(column)
+        bitmap = self.bitmap(filters)
+        if bitmap is not self._full:
+            mask = np.unpackbits(bitmap, count=self.n_rows).view(bool)
+            order = order[mask[order]]
+        return order if ascending else order[::-1]
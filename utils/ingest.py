@@ -0,0 +1,158 @@
+# Ingest xlsx/CSV thành dataset Parquet partition kiểu Hive (cách chạy: xem README).
+# Đọc từng chunk giới hạn và chuẩn hoá về schema Arrow cố định trước khi ghi,
+# nên bộ nhớ đỉnh theo kích thước chunk chứ không theo kích thước file
+import argparse
+import os
+import shutil
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.manifest import MANIFEST_NAME, ManifestBuilder, write_manifest
+from utils.schema import NUMERIC_COLUMNS, apply_schema
+
+CHUNK_SIZE = 100_000
+PARTITION_COLUMNS = ["Season", "Category"]
+
+# Kiểu lưu trữ cố định để mọi chunk ghi ra cùng một schema Parquet
+STORAGE_TYPES = {
+    "Customer ID": pa.int64(),
+    "Age": pa.int16(),
+    "Purchase Amount (USD)": pa.int32(),
+    "Review Rating": pa.float32(),
+    "Previous Purchases": pa.int32(),
+}
+
+
+def iter_xlsx_chunks(path, chunk_size=CHUNK_SIZE):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(path, chunk_size=CHUNK_SIZE):
+    try:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    except pd.errors.EmptyDataError:
+        return
+
+
+def iter_parquet_batches(path, chunk_size=CHUNK_SIZE):
+    # File hoặc thư mục Parquet (partition kiểu Hive), trả về pa.RecordBatch
+    dataset = ds.dataset(path, format="parquet", partitioning="hive", exclude_invalid_files=True)
+    yield from dataset.to_batches(batch_size=chunk_size)
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    if path.endswith(".csv"):
+        return iter_csv_chunks(path, chunk_size)
+    return iter_xlsx_chunks(path, chunk_size)
+
+
+def storage_schema(columns):
+    return pa.schema([(column, STORAGE_TYPES.get(column, pa.string())) for column in columns])
+
+
+def normalize_chunk(chunk):
+    chunk = chunk.rename(columns=lambda column: str(column).strip())
+    normalized = {}
+    for column in chunk.columns:
+        series = chunk[column]
+        if column in NUMERIC_COLUMNS:
+            normalized[column] = pd.to_numeric(series, errors="coerce")
+        else:
+            # Excel có thể trả về số trong cột chữ; chuẩn hoá về str, giữ None
+            series = series.where(series.isna(), series.astype(str).str.strip())
+            normalized[column] = series.astype(object).where(series.notna(), None)
+    chunk = pd.DataFrame(normalized)
+    return pa.Table.from_pandas(chunk, schema=storage_schema(chunk.columns), preserve_index=False)
+
+
+def ingest(source, output, chunk_size=CHUNK_SIZE, partition_by=PARTITION_COLUMNS, progress=None):
+    # Ghi vào thư mục tạm rồi đổi tên, để dashboard không đọc phải dataset đang ghi dở
+    tmp_output = f"{output.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_output, ignore_errors=True)
+    os.makedirs(tmp_output)
+
+    schema = None
+    total_rows = 0
+    manifest = ManifestBuilder()
+    for number, chunk in enumerate(iter_chunks(source, chunk_size)):
+        table = normalize_chunk(chunk)
+        manifest.update(table)
+        if schema is None:
+            schema = table.schema
+        pq.write_to_dataset(
+            table,
+            tmp_output,
+            partition_cols=[column for column in partition_by if column in table.column_names],
+            basename_template=f"part-{number:05d}-{{i}}.parquet",
+        )
+        total_rows += table.num_rows
+        if progress:
+            progress(number + 1, total_rows)
+
+    if schema is not None:
+        # Lưu schema đầy đủ (kể cả cột partition) và thứ tự cột gốc
+        pq.write_metadata(schema, os.path.join(tmp_output, "_common_metadata"))
+
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(tmp_output, output)
+
+    # Thống kê tổng quan cho sidebar/overview, tính luôn trong lúc ghi
+    from utils.data_loader import source_version
+
+    write_manifest(manifest.result(source_version(output)), os.path.join(output, MANIFEST_NAME))
+    return total_rows
+
+
+def read_partitioned(root):
+    # Đọc lại dataset do ingest ghi, giữ thứ tự cột gốc (cột partition bị pyarrow đưa xuống cuối)
+    data = pd.read_parquet(root)
+    metadata_path = os.path.join(root, "_common_metadata")
+    if os.path.exists(metadata_path):
+        data = data[[column for column in pq.read_schema(metadata_path).names if column in data.columns]]
+    return apply_schema(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an xlsx/CSV source into partitioned Parquet.")
+    parser.add_argument("source")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--partition-by", nargs="*", default=PARTITION_COLUMNS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    total_rows = ingest(
+        args.source,
+        args.output,
+        chunk_size=args.chunk_size,
+        partition_by=args.partition_by,
+        progress=lambda chunks, rows: print(f"chunk {chunks}: {rows:,} rows", flush=True),
+    )
+    print(f"Wrote {total_rows:,} rows to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
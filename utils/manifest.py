@@ -0,0 +1,118 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+MANIFEST_NAME = "_manifest.json"
+
+
+class ManifestBuilder:
+    # Cộng dồn thống kê dataset theo từng bảng/batch Arrow: số dòng và, cho từng cột, số giá trị khác nhau,
+    # số null, độ đầy đủ, min/max/mean (cột số), để hiển thị tổng quan mà không phải nạp dataset
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, table):
+        self.rows += table.num_rows
+        for name in table.column_names:
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+            stats = self.columns.setdefault(name, {"type": str(column.type), "nulls": 0, "distinct": None})
+            stats["nulls"] += column.null_count
+            unique = pc.unique(pc.drop_null(column))
+            if stats["distinct"] is not None:
+                unique = pc.unique(pa.chunked_array([stats["distinct"], unique]))
+            stats["distinct"] = unique
+            if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+                extremes = pc.min_max(column).as_py()
+                total = pc.sum(column, min_count=0).as_py() or 0
+                stats["sum"] = stats.get("sum", 0) + total
+                stats["count"] = stats.get("count", 0) + len(column) - column.null_count
+                for key, pick in (("min", min), ("max", max)):
+                    if extremes[key] is not None:
+                        stats[key] = extremes[key] if stats.get(key) is None else pick(stats[key], extremes[key])
+            if pa.types.is_integer(column.type) and len(column):
+                # Tăng ngặt theo thứ tự dòng (kéo theo duy nhất): cột như vậy thay được cho số thứ tự dòng
+                increasing = stats.get("increasing", True) and column.null_count == 0
+                if increasing and len(column) > 1:
+                    increasing = pc.all(pc.greater(column[1:], column[:-1])).as_py()
+                if increasing and "last" in stats:
+                    increasing = column[0].as_py() > stats["last"]
+                stats["increasing"] = increasing
+                stats["last"] = column[-1].as_py()
+
+    def result(self, version=None):
+        columns = {}
+        cells = non_null = 0
+        for name, stats in self.columns.items():
+            entry = {
+                "type": stats["type"],
+                "distinct": len(stats["distinct"]),
+                "nulls": stats["nulls"],
+                "completeness": 1 - stats["nulls"] / self.rows if self.rows else 1.0,
+            }
+            if "sum" in stats:
+                entry["min"] = stats.get("min")
+                entry["max"] = stats.get("max")
+                entry["mean"] = stats["sum"] / stats["count"] if stats["count"] else None
+            if "increasing" in stats:
+                entry["increasing"] = stats["increasing"]
+            columns[name] = entry
+            cells += self.rows
+            non_null += self.rows - stats["nulls"]
+        return {
+            "version": version,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "rows": self.rows,
+            "completeness": non_null / cells if cells else 1.0,
+            "columns": columns,
+        }
+
+
+def append_manifest(manifest, delta, distinct, version=None):
+    # Gộp manifest với manifest của các dòng nối thêm. Số đếm, min/max, mean gộp chính xác; số giá trị
+    # khác nhau thì không, nên bên gọi truyền vào distinct (cột -> số lượng) của dữ liệu đã gộp
+    rows = manifest["rows"] + delta["rows"]
+    columns = {}
+    cells = non_null = 0
+    for name, old in manifest["columns"].items():
+        new = delta["columns"].get(name, {"nulls": 0})
+        entry = dict(old, distinct=distinct[name], nulls=old["nulls"] + new["nulls"])
+        entry["completeness"] = 1 - entry["nulls"] / rows if rows else 1.0
+        if "mean" in old:
+            counts = [stats["rows"] - stats["columns"][name]["nulls"] for stats in (manifest, delta)]
+            means = [old["mean"], new.get("mean")]
+            present = [(count, mean) for count, mean in zip(counts, means) if count and mean is not None]
+            entry["mean"] = sum(count * mean for count, mean in present) / sum(count for count, _ in present) if present else None
+            for key, pick in (("min", min), ("max", max)):
+                values = [value for value in (old.get(key), new.get(key)) if value is not None]
+                entry[key] = pick(values) if values else None
+        if "increasing" in old and "increasing" in new:
+            entry["increasing"] = old["increasing"] and new["increasing"] and new["min"] > old["max"]
+        columns[name] = entry
+        cells += rows
+        non_null += rows - entry["nulls"]
+    return {
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "rows": rows,
+        "completeness": non_null / cells if cells else 1.0,
+        "columns": columns,
+    }
+
+
+def write_manifest(manifest, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path):
+    with open(path) as f:
+        return json.load(f)
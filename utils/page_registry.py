@@ -0,0 +1,49 @@
+import importlib
+import sys
+import time
+
+import streamlit as st
+
+# Tên trang -> (module, hàm hiển thị); module chỉ được import khi trang được chọn lần đầu
+PAGES = {
+    "Overview": ("views.overview", "show_overview"),
+    "Visualizations": ("views.visualizations", "show_visualizations"),
+    "Advanced Insights": ("views.insights", "show_insights"),
+}
+
+# Thời gian import lần đầu của từng trang trong process (giây)
+IMPORT_TIMES = {}
+
+
+def load_page(name):
+    module_name, function_name = PAGES[name]
+    if module_name not in sys.modules:
+        started = time.perf_counter()
+        importlib.import_module(module_name)
+        IMPORT_TIMES[name] = time.perf_counter() - started
+    return getattr(sys.modules[module_name], function_name)
+
+
+def record_startup(page, script_started):
+    # Lần chạy đầu tiên của session = thời gian tới khi trang đầu tiên được vẽ xong
+    elapsed = time.perf_counter() - script_started
+    if "startup_timing" not in st.session_state:
+        st.session_state["startup_timing"] = {"page": page, "first_render": elapsed}
+    st.session_state["last_rerun"] = {"page": page, "elapsed": elapsed}
+
+
+def show_startup_report():
+    startup = st.session_state.get("startup_timing")
+    last_rerun = st.session_state.get("last_rerun")
+    if startup is None:
+        return
+    with st.sidebar.expander("⏱️ Startup Timing"):
+        col1, col2 = st.columns(2)
+        col1.metric("First render", f"{startup['first_render'] * 1000:.0f} ms", help=f"New session, {startup['page']} page")
+        col2.metric("Last rerun", f"{last_rerun['elapsed'] * 1000:.0f} ms", help=f"{last_rerun['page']} page")
+        st.caption("Page imports in this process (first selection only):")
+        for name in PAGES:
+            if name in IMPORT_TIMES:
+                st.caption(f"• {name}: {IMPORT_TIMES[name] * 1000:.0f} ms")
+            else:
+                st.caption(f"• {name}: not loaded")
@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+PERF_LOG_PATH = os.environ.get("SHOPPING_PERF_LOG", "logs/perf.jsonl")
+# Bật mặc định bằng SHOPPING_PERF=1; mỗi session có thể bật/tắt trong sidebar
+PERF_DEFAULT = os.environ.get("SHOPPING_PERF", "0") == "1"
+
+# Mỗi lần rerun chạy trên thread của ScriptRunner nên span được gom theo thread
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class _Span:
+    __slots__ = ("name", "recorder", "started", "depth")
+
+    def __init__(self, name, recorder):
+        self.name = name
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.depth = self.recorder["depth"]
+        self.recorder["depth"] += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.recorder["depth"] -= 1
+        self.recorder["spans"].append({
+            "name": self.name,
+            "start_ms": (self.started - self.recorder["started"]) * 1000,
+            "ms": elapsed * 1000,
+            "depth": self.depth,
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name):
+    # Khi tắt instrumentation chỉ tốn một lần getattr và trả về span rỗng dùng chung
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        return _NOOP
+    return _Span(name, recorder)
+
+
+def begin_rerun():
+    if st.session_state.get("perf_enabled", PERF_DEFAULT):
+        _local.recorder = {"started": time.perf_counter(), "depth": 0, "spans": []}
+    else:
+        _local.recorder = None
+
+
+def _write_log(record):
+    try:
+        os.makedirs(os.path.dirname(PERF_LOG_PATH) or ".", exist_ok=True)
+        with _log_lock, open(PERF_LOG_PATH, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+
+
+def end_rerun(page):
+    recorder = getattr(_local, "recorder", None)
+    _local.recorder = None
+    if recorder is None:
+        return
+    if "perf_session" not in st.session_state:
+        st.session_state["perf_session"] = uuid.uuid4().hex[:12]
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "session": st.session_state["perf_session"],
+        "page": page,
+        "total_ms": (time.perf_counter() - recorder["started"]) * 1000,
+        "spans": sorted(recorder["spans"], key=lambda item: item["start_ms"]),
+    }
+    st.session_state["perf_last"] = record
+    _write_log(record)
+
+
+@contextmanager
+def fragment_span(name):
+    # Fragment chạy lại riêng không đi qua app.py, nên tự ghi nhận như một rerun riêng
+    if getattr(_local, "recorder", None) is not None:
+        with span(f"fragment:{name}"):
+            yield
+        return
+    begin_rerun()
+    try:
+        yield
+    finally:
+        end_rerun(f"fragment:{name}")
+
+
+def show_perf_panel():
+    with st.sidebar.expander("🧭 Performance"):
+        st.toggle("Record stage timings", value=PERF_DEFAULT, key="perf_enabled")
+        record = st.session_state.get("perf_last")
+        if not st.session_state.get("perf_enabled") or record is None:
+            st.caption("Timings appear from the next rerun.")
+            return
+        st.metric("Rerun", f"{record['total_ms']:.0f} ms", help=f"{record['page']} page")
+        breakdown = pd.DataFrame([
+            {
+                "Stage": "  " * item["depth"] + item["name"],
+                "ms": round(item["ms"], 1),
+                "% of rerun": round(item["ms"] / record["total_ms"] * 100, 1),
+            }
+            for item in record["spans"]
+        ])
+        st.dataframe(breakdown, hide_index=True, use_container_width=True)
+        st.caption(f"Logged to {PERF_LOG_PATH}")
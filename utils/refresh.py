@@ -0,0 +1,216 @@
+import copy
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import streamlit as st
+
+from utils.cube import append_cube
+from utils.data_loader import (
+    DATA_PATH,
+    _manifest_path,
+    _read_source,
+    _sidecar_path,
+    _write_sidecar,
+    get_artifact,
+    get_data_version,
+    publish_version,
+    source_version,
+)
+from utils.manifest import MANIFEST_NAME, ManifestBuilder, append_manifest, write_manifest
+from utils.schema import append_rows, apply_schema
+from utils.shared_store import map_arrow
+
+WATCH_INTERVAL = float(os.environ.get("SHOPPING_WATCH_INTERVAL", "2"))
+WATCH_ENABLED = os.environ.get("SHOPPING_WATCH", "1") == "1"
+
+
+def _listing(path):
+    # file -> (size, mtime_ns); nguồn là một file thì chỉ có một mục
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return {"": (stat.st_size, stat.st_mtime_ns)}
+    listing = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name == MANIFEST_NAME:
+                continue
+            full_path = os.path.join(root, name)
+            stat = os.stat(full_path)
+            listing[os.path.relpath(full_path, path)] = (stat.st_size, stat.st_mtime_ns)
+    return listing
+
+
+def _row_hashes(frame):
+    # Hash từng dòng sau khi đưa về kiểu chung, để so sánh không phụ thuộc downcast/category
+    normalized = {
+        column: frame[column].astype("float64") if pd.api.types.is_numeric_dtype(frame[column]) else frame[column].astype(str)
+        for column in frame.columns
+    }
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False).to_numpy()
+
+
+def _csv_delta(path, old_listing, old_version, columns):
+    # Append-only khi phần đầu file mới trùng từng byte với file cũ (cùng hash = phiên bản cũ)
+    old_size = old_listing[""][0]
+    with open(path, "rb") as f:
+        head = f.read(old_size)
+        if not head.endswith(b"\n") or hashlib.sha1(head).hexdigest()[:16] != old_version:
+            return None
+        tail = f.read()
+    if not tail.strip():
+        return pd.DataFrame(columns=columns)
+    return apply_schema(pd.read_csv(io.BytesIO(tail), header=None, names=columns))
+
+
+def _parquet_delta(path, old_listing, listing, columns):
+    # Thư mục Parquet: append-only khi mọi file cũ còn nguyên, chỉ đọc các file mới
+    if any(listing.get(name) != stat for name, stat in old_listing.items()):
+        return None
+    added = [os.path.join(path, name) for name in listing if name not in old_listing and name.endswith(".parquet")]
+    if not added:
+        return pd.DataFrame(columns=columns)
+    dataset = ds.dataset(added, format="parquet", partitioning="hive", partition_base_dir=path)
+    return apply_schema(dataset.to_table().to_pandas()[columns])
+
+
+class DatasetWatcher:
+    # Poll nguồn dữ liệu và công bố phiên bản mới khi nó đổi. Chỉ nối thêm dòng: áp delta vào dataset, index,
+    # cube, manifest và sketch đã dựng rồi nạp sẵn vào cache trước khi công bố; thay đổi khác thì chỉ công bố
+    # phiên bản mới và cache tự dựng lại ở rerun kế tiếp
+
+    def __init__(self, path=DATA_PATH, interval=WATCH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.version = get_data_version(path)
+        # Ghim phiên bản hiện tại: từ đây session chỉ chuyển phiên bản khi watcher công bố
+        publish_version(path, self.version)
+        self.listing = _listing(path)
+        self.events = deque(maxlen=10)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as error:
+                # File có thể đang được ghi dở; thử lại ở lần poll sau
+                self._record("error", detail=str(error))
+
+    def _record(self, kind, **details):
+        self.events.appendleft({"time": datetime.now().strftime("%H:%M:%S"), "kind": kind, **details})
+
+    def check(self):
+        with self._lock:
+            listing = _listing(self.path)
+            if listing == self.listing:
+                return
+            started = time.perf_counter()
+            version = source_version(self.path)
+            if version != self.version:
+                delta = self._apply_delta(listing, version)
+                if delta is None:
+                    publish_version(self.path, version)
+                    self._record("rebuild", version=version)
+                else:
+                    artifacts, rows = delta
+                    publish_version(self.path, version, artifacts)
+                    self._record("append", version=version, rows=rows, ms=(time.perf_counter() - started) * 1000)
+                self.version = version
+            self.listing = listing
+
+    def _read_delta(self, listing, data):
+        columns = data.columns.tolist()
+        if os.path.isdir(self.path):
+            delta = _parquet_delta(self.path, self.listing, listing, columns)
+            return delta, None if delta is None else append_rows(data, delta)
+        if self.path.endswith(".csv"):
+            delta = _csv_delta(self.path, self.listing, self.version, columns)
+            return delta, None if delta is None else append_rows(data, delta)
+        if self.path.endswith((".xlsx", ".xls")):
+            # xlsx phải đọc lại cả file, nhưng chỉ các dòng mới được đưa vào index/cube/sketch
+            new_data = _read_source(self.path)
+            if len(new_data) < len(data) or not (_row_hashes(new_data.iloc[:len(data)]) == _row_hashes(data)).all():
+                return None, None
+            return new_data.iloc[len(data):].reset_index(drop=True), new_data
+        # File Parquet đơn không append được, luôn dựng lại
+        return None, None
+
+    def _apply_delta(self, listing, version):
+        data = get_artifact(self.path, self.version, "data")
+        if data is None:
+            # Chưa session nào nạp dữ liệu ở phiên bản cũ: không có gì để cập nhật
+            return None
+        delta, merged = self._read_delta(listing, data)
+        if delta is None:
+            return None
+
+        artifacts = {"data": merged}
+        index = get_artifact(self.path, self.version, "index")
+        if index is not None:
+            artifacts["index"] = index.appended(merged)
+        cube = get_artifact(self.path, self.version, "cube")
+        if cube is not None:
+            artifacts["cube"] = append_cube(cube, delta) if len(delta) else cube
+        sketches = get_artifact(self.path, self.version, "sketches")
+        if sketches is not None:
+            # Session khác có thể đang đọc sketch cũ nên cập nhật trên bản sao
+            sketches = copy.deepcopy(sketches)
+            if len(delta):
+                sketches.update(delta)
+            artifacts["sketches"] = sketches
+        manifest = get_artifact(self.path, self.version, "manifest")
+        if manifest is not None:
+            builder = ManifestBuilder()
+            if len(delta):
+                builder.update(pa.Table.from_pandas(delta, preserve_index=False))
+            distinct = {
+                column: len(merged[column].cat.categories)
+                if isinstance(merged[column].dtype, pd.CategoricalDtype) else int(merged[column].nunique())
+                for column in merged.columns
+            }
+            artifacts["manifest"] = append_manifest(manifest, builder.result(), distinct, version)
+
+        try:
+            _write_sidecar(merged, self.path, version)
+            # Chuyển sang bản đã map để dữ liệu mới cũng được chia sẻ giữa các process
+            artifacts["data"] = map_arrow(_sidecar_path(self.path, version))
+            if "manifest" in artifacts:
+                write_manifest(artifacts["manifest"], _manifest_path(self.path, version))
+        except OSError:
+            pass
+        return artifacts, len(delta)
+
+
+@st.cache_resource(show_spinner=False)
+def start_watcher(path=DATA_PATH):
+    # Một watcher cho mỗi nguồn dữ liệu trong process
+    return DatasetWatcher(path) if WATCH_ENABLED else None
+
+
+def show_refresh_status(path=DATA_PATH):
+    watcher = start_watcher(path)
+    if watcher is None:
+        return
+    with st.sidebar.expander("🔄 Data Refresh"):
+        st.caption(f"Watching {path} every {watcher.interval:g}s · version {get_data_version(path)[:8]}")
+        for event in list(watcher.events):
+            if event["kind"] == "append":
+                st.caption(f"• {event['time']} appended {event['rows']:,} rows in {event['ms']:.0f} ms")
+            elif event["kind"] == "rebuild":
+                st.caption(f"• {event['time']} rows changed: full rebuild")
+            else:
+                st.caption(f"• {event['time']} error: {event['detail']}")
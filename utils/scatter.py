@@ -0,0 +1,45 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Trên ngưỡng này scatter chuyển sang chế độ dữ liệu lớn
+SCATTER_POINT_LIMIT = 100_000
+
+
+def binned_scatter_figure(grid, x, y, color_by, size_by, title):
+    # Vẽ mỗi ô khác rỗng của lưới mật độ (QueryBackend.density_grid) thành một marker
+    groups, x_edges, y_edges = grid["groups"], grid["x_edges"], grid["y_edges"]
+    counts, size_sums = grid["counts"], grid["size_sums"]
+
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    colors = px.colors.qualitative.Plotly
+    max_count = max(int(counts.max()), 1)
+
+    fig = go.Figure()
+    for code, group in enumerate(groups):
+        x_index, y_index = np.nonzero(counts[code])
+        if len(x_index) == 0:
+            continue
+        cell_counts = counts[code, x_index, y_index]
+        fig.add_trace(go.Scattergl(
+            x=x_centers[x_index],
+            y=y_centers[y_index],
+            mode="markers",
+            name=str(group),
+            marker=dict(
+                color=colors[code % len(colors)],
+                size=cell_counts,
+                sizemode="area",
+                sizeref=max_count / 30 ** 2,
+                sizemin=2,
+                opacity=0.7,
+            ),
+            customdata=np.column_stack([cell_counts, size_sums[code, x_index, y_index] / cell_counts]),
+            hovertemplate=(
+                f"{color_by}={group}<br>{x}=%{{x:.1f}}<br>{y}=%{{y:.1f}}"
+                f"<br>Rows=%{{customdata[0]}}<br>Avg {size_by}=%{{customdata[1]:.2f}}<extra></extra>"
+            ),
+        ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title_text=color_by)
+    return fig
@@ -0,0 +1,85 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Các cột ít giá trị khác nhau -> lưu dạng Categorical
+CATEGORICAL_COLUMNS = [
+    "Gender",
+    "Item Purchased",
+    "Category",
+    "Location",
+    "Size",
+    "Color",
+    "Season",
+    "Subscription Status",
+    "Payment Method",
+    "Shipping Type",
+    "Discount Applied",
+    "Promo Code Used",
+    "Preferred Payment Method",
+    "Frequency of Purchases",
+]
+
+NUMERIC_COLUMNS = [
+    "Customer ID",
+    "Age",
+    "Purchase Amount (USD)",
+    "Review Rating",
+    "Previous Purchases",
+]
+
+
+def _compact_column(series):
+    if series.name in CATEGORICAL_COLUMNS:
+        return series.astype("category")
+    if series.name in NUMERIC_COLUMNS:
+        if pd.api.types.is_integer_dtype(series):
+            return pd.to_numeric(series, downcast="integer")
+        # float32 giữ đủ độ chính xác cho rating 1 chữ số thập phân
+        return pd.to_numeric(series, downcast="float")
+    return series
+
+
+def apply_schema(data):
+    return pd.DataFrame({column: _compact_column(data[column]) for column in data.columns})
+
+
+def append_rows(data, new_rows):
+    # pd.concat biến hai Categorical khác category thành object, nên gộp category trước
+    columns = {}
+    for column in data.columns:
+        old, new = data[column], new_rows[column].reset_index(drop=True)
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            columns[column] = pd.Series(
+                union_categoricals([old, new.astype("category")], sort_categories=True, ignore_order=True), name=column
+            )
+        else:
+            columns[column] = _compact_column(pd.concat([old, new], ignore_index=True).rename(column))
+    return pd.DataFrame(columns)
+
+
+def _source_dtype(series):
+    # dtype mà read_excel/read_csv trả về trước khi áp dụng schema
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.dtype
+    if pd.api.types.is_integer_dtype(series):
+        return "int64"
+    if pd.api.types.is_float_dtype(series):
+        return "float64"
+    return series.dtype
+
+
+def memory_report(data):
+    rows = []
+    for column in data.columns:
+        series = data[column]
+        source_dtype = _source_dtype(series)
+        rows.append({
+            "Column": column,
+            "Before dtype": str(source_dtype),
+            "After dtype": str(series.dtype),
+            "Before (bytes)": int(series.astype(source_dtype).memory_usage(deep=True, index=False)),
+            "After (bytes)": int(series.memory_usage(deep=True, index=False)),
+        })
+    report = pd.DataFrame(rows)
+    report["Reduction"] = report["Before (bytes)"] / report["After (bytes)"].clip(lower=1)
+    return report
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Tên phân khúc -> (cột, bins của pd.cut, nhãn)
+SEGMENT_SCHEMES = {
+    "Purchase Amount": (
+        "Purchase Amount (USD)", 3, ["Low Spender", "Medium Spender", "High Spender"]
+    ),
+    "Age Group": (
+        "Age", [0, 25, 45, 65, 100], ["Young (≤25)", "Adult (26-45)", "Middle-aged (46-65)", "Senior (65+)"]
+    ),
+    "Review Rating": (
+        "Review Rating", [0, 3.0, 4.0, 5.0], ["Low Rating (≤3.0)", "Medium Rating (3.0-4.0)", "High Rating (>4.0)"]
+    ),
+    "Previous Purchases": (
+        "Previous Purchases", 3, ["New Customer", "Regular Customer", "Loyal Customer"]
+    ),
+}
+SEGMENT_MEASURES = ["Purchase Amount (USD)", "Review Rating", "Age"]
+
+
+def segment_edges(bins, low, high):
+    # Cùng cạnh bin như pd.cut: bins là số nguyên thì chia đều [low, high] và nới cạnh trái 0.1%
+    if not np.isscalar(bins):
+        return np.asarray(bins, dtype="float64")
+    if low == high:
+        adjust = 0.001 * abs(low) if low != 0 else 0.001
+        return np.linspace(low - adjust, high + adjust, bins + 1)
+    edges = np.linspace(low, high, bins + 1)
+    edges[0] -= (high - low) * 0.001
+    return edges
+
+
+def segment_codes(values, edges):
+    # Khoảng (a, b] như pd.cut; ngoài mọi khoảng hoặc NaN -> -1
+    values = np.asarray(values, dtype="float64")
+    codes = np.searchsorted(edges, values, side="left") - 1
+    codes[(values <= edges[0]) | (values > edges[-1]) | np.isnan(values)] = -1
+    return codes.astype(np.int8)
+
+
+def summarize(labels, counts, sums, value_counts):
+    # Frame theo từng phân khúc (index Segment): Rows và (measure, "count"/"mean")
+    result = {("Rows", "count"): counts}
+    for measure in SEGMENT_MEASURES:
+        result[(measure, "count")] = value_counts[measure]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[(measure, "mean")] = np.where(value_counts[measure] > 0, sums[measure] / value_counts[measure], np.nan)
+    return pd.DataFrame(result, index=pd.Index(labels, name="Segment"))
+
+
+class SegmentTable:
+    # Mã phân khúc int8 cho mọi cách phân khúc, dựng một lần cho mỗi phiên bản dữ liệu;
+    # summary(scheme, rows) tính tập đã lọc bằng np.bincount trên mã thay vì chia bin lại
+
+    def __init__(self, data):
+        self.codes = {}
+        self.edges = {}
+        self._measures = {}
+        for measure in SEGMENT_MEASURES:
+            values = data[measure].to_numpy(dtype="float64", na_value=np.nan)
+            self._measures[measure] = (np.nan_to_num(values), ~np.isnan(values))
+        for scheme, (column, bins, _) in SEGMENT_SCHEMES.items():
+            values = data[column].to_numpy(dtype="float64", na_value=np.nan)
+            self.edges[scheme] = segment_edges(bins, np.nanmin(values), np.nanmax(values))
+            self.codes[scheme] = segment_codes(values, self.edges[scheme])
+        self.summaries = {scheme: self.summary(scheme) for scheme in SEGMENT_SCHEMES}
+
+    def summary(self, scheme, rows=None):
+        if rows is None and scheme in getattr(self, "summaries", {}):
+            return self.summaries[scheme]
+        labels = SEGMENT_SCHEMES[scheme][2]
+        codes = self.codes[scheme] if rows is None else self.codes[scheme][rows]
+        # Dồn -1 (không thuộc phân khúc nào) vào một ô thừa ở cuối rồi bỏ đi
+        slots = np.where(codes < 0, len(labels), codes)
+        size = len(labels) + 1
+        counts = np.bincount(slots, minlength=size)[:-1]
+        sums, value_counts = {}, {}
+        for measure, (values, present) in self._measures.items():
+            if rows is not None:
+                values, present = values[rows], present[rows]
+            sums[measure] = np.bincount(slots, weights=values, minlength=size)[:-1]
+            value_counts[measure] = np.bincount(slots, weights=present, minlength=size)[:-1].astype(np.int64)
+        return summarize(labels, counts, sums, value_counts)
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from utils.ingest import CHUNK_SIZE
+
+# path -> (địa chỉ, kích thước) của vùng đã memory-map, để phân loại bộ nhớ trong báo cáo
+_regions = {}
+
+
+def write_arrow(data, path):
+    # Một record batch duy nhất: to_pandas chỉ zero-copy khi mỗi cột có đúng một chunk
+    table = pa.Table.from_pandas(data, preserve_index=False).combine_chunks()
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(tmp_path, path)
+
+
+def map_arrow(path):
+    # Map file Arrow IPC chỉ đọc và bọc các buffer thành DataFrame: cột số và mã categorical trỏ thẳng vào
+    # vùng map, nên mọi session và mọi process map cùng file dùng chung một bản trong page cache của OS
+    buffer = pa.memory_map(path, "r").read_buffer()
+    _regions[path] = (buffer.address, buffer.size)
+    table = ipc.open_file(buffer).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def iter_arrow_batches(path, chunk_size=CHUNK_SIZE):
+    # Cắt batch trên vùng đã map, không copy
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    yield from table.to_batches(max_chunksize=chunk_size)
+
+
+def _buffers(series):
+    # (địa chỉ, số byte) của các buffer dữ liệu của một cột
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.array.codes
+        return [(codes.__array_interface__["data"][0], codes.nbytes)] + _buffers(series.cat.categories.to_series())
+    if hasattr(series.array, "__arrow_array__"):
+        array = pa.array(series.array)
+        chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+        return [(buffer.address, buffer.size) for chunk in chunks for buffer in chunk.buffers() if buffer is not None]
+    values = series.to_numpy()
+    if values.dtype == object:
+        return [(0, int(series.memory_usage(deep=True, index=False)))]
+    return [(values.__array_interface__["data"][0], values.nbytes)]
+
+
+def _is_mapped(address):
+    return any(start <= address < start + size for start, size in _regions.values())
+
+
+def _nbytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(key) + _nbytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def sharing_report(data, session_state):
+    # Số byte theo phạm vi: vùng map (mọi process dùng chung), heap của process (các session
+    # trong process dùng chung) và state riêng của session này
+    mapped = heap = 0
+    for column in data.columns:
+        for address, size in _buffers(data[column]):
+            if _is_mapped(address):
+                mapped += size
+            else:
+                heap += size
+    session = sum(_nbytes(value) for value in session_state.to_dict().values())
+    return pd.DataFrame([
+        {"Scope": "Shared by all processes", "Holds": "Dataset columns in the memory-mapped Arrow file", "Bytes": mapped},
+        {"Scope": "Shared by sessions in this process", "Holds": "Category labels and any dataset columns copied to the heap", "Bytes": heap},
+        {"Scope": "This session", "Holds": "Widget and session state", "Bytes": session},
+    ])
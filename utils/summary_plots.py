@@ -0,0 +1,100 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Các hàm vẽ nhận thống kê đã tính sẵn (QueryBackend.box_stats / violin_stats / histogram),
+# payload không phụ thuộc số dòng
+
+
+def box_figure(summaries, y, x=None, title=None):
+    # Box plot từ tứ phân vị tính sẵn; summaries là [(nhóm, box_summary)]
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for position, (group, stats) in enumerate(summaries):
+        name = str(group) if x else y
+        color = colors[position % len(colors)]
+        fig.add_trace(go.Box(
+            x=[name],
+            q1=[stats["q1"]],
+            median=[stats["median"]],
+            q3=[stats["q3"]],
+            lowerfence=[stats["lowerfence"]],
+            upperfence=[stats["upperfence"]],
+            mean=[stats["mean"]],
+            name=name,
+            marker_color=color,
+            boxpoints=False,
+        ))
+        if len(stats["outliers"]):
+            fig.add_trace(go.Scatter(
+                x=[name] * len(stats["outliers"]),
+                y=stats["outliers"],
+                mode="markers",
+                marker=dict(color=color, size=5),
+                name=f"{name} outliers",
+                showlegend=False,
+            ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def violin_figure(summaries, y, x=None, title=None):
+    # Violin vẽ từ đường KDE tính sẵn, kèm box nhỏ ở giữa; summaries là [(nhóm, violin_summary)]
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    names = []
+    for position, (group, stats) in enumerate(summaries):
+        grid, density = stats["grid"], stats["density"]
+        name = str(group) if x else y
+        names.append(name)
+        color = colors[position % len(colors)]
+        half_width = 0.4 * density / density.max()
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([position - half_width, (position + half_width)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill="toself",
+            mode="lines",
+            line=dict(color=color, width=1),
+            name=name,
+            hoverinfo="skip",
+        ))
+        hover = (
+            f"{name}<br>q1={stats['q1']:.2f}<br>median={stats['median']:.2f}"
+            f"<br>q3={stats['q3']:.2f}<extra></extra>"
+        )
+        for low, high, width in [(stats["lowerfence"], stats["upperfence"], 1), (stats["q1"], stats["q3"], 6)]:
+            fig.add_trace(go.Scatter(
+                x=[position, position],
+                y=[low, high],
+                mode="lines",
+                line=dict(color="black", width=width),
+                showlegend=False,
+                hovertemplate=hover,
+            ))
+        fig.add_trace(go.Scatter(
+            x=[position],
+            y=[stats["median"]],
+            mode="markers",
+            marker=dict(color="white", size=6),
+            showlegend=False,
+            hovertemplate=hover,
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(tickmode="array", tickvals=list(range(len(names))), ticktext=names, title=x),
+        yaxis_title=y,
+    )
+    return fig
+
+
+def histogram_figure(edges, counts, x, title=None):
+    # Histogram từ số đếm theo bin, không gửi giá trị từng dòng xuống trình duyệt
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate=f"{x}=%{{customdata[0]:.2f}}–%{{customdata[1]:.2f}}<br>count=%{{y}}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title="count", bargap=0)
+    return fig
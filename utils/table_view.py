@@ -0,0 +1,41 @@
+import math
+
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 500]
+
+
+def show_paged_table(backend, filters, key="table"):
+    # Chỉ lấy và gửi cửa sổ đang xem xuống trình duyệt thay vì cả bảng đã lọc
+    total = backend.count(filters)
+    all_columns = backend.columns()
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        columns = st.multiselect("Columns", all_columns, default=all_columns, key=f"{key}_columns")
+    with col2:
+        sort_by = st.selectbox("Sort By", ["None"] + all_columns, key=f"{key}_sort")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    with col4:
+        n_pages = max(1, math.ceil(total / page_size))
+        # Trang hiện tại do session_state quản lý (không truyền value cho widget);
+        # bộ lọc thu hẹp lại thì đưa nó về trong giới hạn
+        page_key = f"{key}_page"
+        if page_key not in st.session_state:
+            st.session_state[page_key] = 1
+        elif st.session_state[page_key] > n_pages:
+            st.session_state[page_key] = n_pages
+        page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    ascending = True
+    if sort_by != "None":
+        ascending = st.toggle("Ascending", value=True, key=f"{key}_ascending")
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    window = backend.window(
+        filters, start, stop, columns=columns or None, sort_by=None if sort_by == "None" else sort_by, ascending=ascending
+    )
+    st.caption(f"Rows {start + 1 if total else 0}–{stop} of {total} · page {page} of {n_pages}")
+    st.dataframe(window, use_container_width=True)
@@ -0,0 +1,273 @@
+import streamlit as st
+import plotly.express as px
+from utils.correlation import strongest_correlations
+from utils.backend import get_backend
+from utils.data_loader import get_data_version, get_quantile_sketches
+from utils.figure_cache import figure_key, get_figure_cache, show_figure_cache_stats
+from utils.perf import fragment_span, span
+from utils.summary_plots import box_figure, histogram_figure, violin_figure
+
+NUMERIC_COLUMNS = ["Age", "Purchase Amount (USD)", "Review Rating", "Previous Purchases"]
+
+def _outlier_chart(backend, outlier_var, lower_bound, upper_bound):
+    fig = box_figure(backend.box_stats(outlier_var), y=outlier_var, title=f"Outlier Detection for {outlier_var}")
+    fig.add_hline(y=lower_bound, line_dash="dash", line_color="red", 
+                 annotation_text="Lower Bound")
+    fig.add_hline(y=upper_bound, line_dash="dash", line_color="red", 
+                 annotation_text="Upper Bound")
+    return fig
+
+def _distribution_chart(backend, dist_var, plot_type):
+    # Backend chỉ trả về số đếm theo bin / tứ phân vị / đường KDE, không trả các dòng
+    if plot_type == "Histogram":
+        return histogram_figure(*backend.histogram(dist_var), x=dist_var, title=f"Distribution of {dist_var}")
+    elif plot_type == "Box Plot":
+        return box_figure(backend.box_stats(dist_var), y=dist_var, title=f"Box Plot of {dist_var}")
+    else:  # Violin Plot
+        return violin_figure(backend.violin_stats(dist_var), y=dist_var, title=f"Violin Plot of {dist_var}")
+
+def _sketch_caption(sketches, column, by=None):
+    error = sketches.rank_error(column, by)
+    if error == 0:
+        st.caption("Quantiles from KLL sketch (exact at this dataset size).")
+    else:
+        st.caption(
+            f"≈ Quantiles from KLL sketch (k={sketches.k}): within ±{error:.1%} of rank at 99% confidence; "
+            "count, mean, std, min and max are exact."
+        )
+
+# Mỗi phần phân tích là một fragment: widget bên trong chỉ chạy lại phần đó
+@st.fragment
+def _correlation_section(backend, version):
+    with fragment_span("correlation"):
+        # Interactive correlation analysis
+        st.subheader("📊 Correlation Analysis")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_columns = st.multiselect(
+                "Select variables for correlation", 
+                NUMERIC_COLUMNS, 
+                default=NUMERIC_COLUMNS
+            )
+        
+        with col2:
+            correlation_method = st.selectbox("Correlation Method", ["Pearson", "Spearman"])
+        
+        # Giới hạn phân tích trong một nhóm khách hàng
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            gender = st.selectbox("Correlation Gender", ["All"] + sorted(backend.values("Gender")))
+        with col2:
+            category = st.selectbox("Correlation Category", ["All"] + sorted(backend.values("Category")))
+        with col3:
+            season = st.selectbox("Correlation Season", ["All"] + sorted(backend.values("Season")))
+        filters = {}
+        if gender != "All":
+            filters["Gender"] = gender
+        if category != "All":
+            filters["Category"] = category
+        if season != "All":
+            filters["Season"] = season
+        
+        if len(selected_columns) >= 2:
+            # Toàn bộ dữ liệu: thống kê đủ đã cache; tập đã lọc: roll-up cube, không quét lại các dòng
+            with span("aggregate:correlation"):
+                correlation_data = backend.correlation(selected_columns, correlation_method.lower(), filters)
+            
+            fig_heatmap = get_figure_cache().get_or_build(
+                figure_key("correlation", version, filters, columns=selected_columns, method=correlation_method),
+                lambda: px.imshow(
+                    correlation_data, 
+                    text_auto=True, 
+                    aspect="auto", 
+                    title=f"{correlation_method} Correlation Matrix",
+                    color_continuous_scale="RdBu_r"
+                )
+            )
+            with span("render:correlation"):
+                st.plotly_chart(fig_heatmap, use_container_width=True)
+            
+            # Show strongest correlations
+            st.write("**Strongest Correlations:**")
+            top_correlations = strongest_correlations(correlation_data, top=3)
+            st.dataframe(top_correlations, hide_index=True)
+
+@st.fragment
+def _segmentation_section(backend, version):
+    with fragment_span("segmentation"):
+        # Customer Segmentation Analysis
+        st.subheader("👥 Customer Segmentation")
+        
+        segment_by = st.selectbox(
+            "Segment customers by", 
+            ["Purchase Amount", "Age Group", "Review Rating", "Previous Purchases"]
+        )
+        
+        # Mã phân khúc int8 và tổng hợp theo phân khúc được tính sẵn một lần cho mỗi phiên bản dữ liệu
+        with span("aggregate:segments"):
+            segment_summary = backend.segment_summary(segment_by)
+            segment_counts = segment_summary[("Rows", "count")].sort_values(ascending=False)
+            segment_metrics = segment_summary[("Purchase Amount (USD)", "mean")].rename('Purchase Amount (USD)').reset_index()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Segment size pie chart
+            fig_pie = get_figure_cache().get_or_build(
+                figure_key("segment_pie", version, segment_by=segment_by),
+                lambda: px.pie(
+                    values=segment_counts.values, 
+                    names=segment_counts.index,
+                    title=f"Customer Distribution by {segment_by}"
+                )
+            )
+            with span("render:segment_pie"):
+                st.plotly_chart(fig_pie, use_container_width=True)
+        
+        with col2:
+            # Segment metrics bar chart
+            fig_bar = get_figure_cache().get_or_build(
+                figure_key("segment_bar", version, segment_by=segment_by),
+                lambda: px.bar(
+                    segment_metrics, 
+                    x='Segment', 
+                    y='Purchase Amount (USD)',
+                    title=f"Average Purchase Amount by {segment_by}"
+                )
+            )
+            with span("render:segment_bar"):
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+@st.fragment
+def _statistical_section(backend, version):
+    with fragment_span("statistical_analysis"):
+        # Advanced Statistical Analysis
+        st.subheader("📈 Statistical Analysis")
+        
+        analysis_type = st.selectbox(
+            "Select Analysis Type", 
+            ["Descriptive Statistics", "Distribution Analysis", "Outlier Detection"]
+        )
+        
+        # Mặc định dùng quantile sketch dựng sẵn khi load; bật để tính chính xác trên toàn cột
+        exact_quantiles = False
+        if analysis_type != "Distribution Analysis":
+            exact_quantiles = st.toggle("Exact quantiles", value=False, key="exact_quantiles")
+        
+        if analysis_type == "Descriptive Statistics":
+            st.write("**Key Statistics Summary**")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_var = st.selectbox("Select Variable", NUMERIC_COLUMNS, key="desc_stats")
+            
+            with col2:
+                group_var = st.selectbox("Group By", ["None", "Gender", "Category", "Season"], key="group_stats")
+            
+            by = None if group_var == "None" else group_var
+            with span("aggregate:describe"):
+                if exact_quantiles:
+                    stats_df = backend.describe(selected_var, by)
+                else:
+                    sketches = get_quantile_sketches()
+                    stats_df = sketches.describe(selected_var, by)
+            st.dataframe(stats_df, use_container_width=True)
+            if not exact_quantiles:
+                _sketch_caption(sketches, selected_var, by)
+        
+        elif analysis_type == "Distribution Analysis":
+            col1, col2 = st.columns(2)
+            with col1:
+                dist_var = st.selectbox("Select Variable", NUMERIC_COLUMNS, key="dist_var")
+            with col2:
+                plot_type = st.selectbox("Plot Type", ["Histogram", "Box Plot", "Violin Plot"], key="dist_plot")
+            
+            fig = get_figure_cache().get_or_build(
+                figure_key("distribution", version, dist_var=dist_var, plot_type=plot_type),
+                lambda: _distribution_chart(backend, dist_var, plot_type)
+            )
+            
+            with span("render:distribution"):
+                st.plotly_chart(fig, use_container_width=True)
+        
+        else:  # Outlier Detection
+            outlier_var = st.selectbox("Select Variable for Outlier Detection", NUMERIC_COLUMNS, key="outlier_var")
+            
+            # Calculate IQR
+            with span("aggregate:outliers"):
+                if exact_quantiles:
+                    Q1, Q3 = backend.quantiles(outlier_var, [0.25, 0.75])
+                else:
+                    sketches = get_quantile_sketches()
+                    Q1, Q3 = sketches.quantiles(outlier_var, [0.25, 0.75])
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                
+                total_records = backend.count()
+                outlier_count, outliers = backend.outliers(
+                    outlier_var, lower_bound, upper_bound, [outlier_var, "Category", "Gender", "Age"]
+                )
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Records", total_records)
+            with col2:
+                st.metric("Outliers Found", outlier_count)
+            with col3:
+                st.metric("Outlier %", f"{(outlier_count/total_records*100):.1f}%")
+            if not exact_quantiles:
+                _sketch_caption(sketches, outlier_var)
+            
+            # Visualize outliers
+            fig = get_figure_cache().get_or_build(
+                figure_key("outliers", version, outlier_var=outlier_var, exact=exact_quantiles),
+                lambda: _outlier_chart(backend, outlier_var, lower_bound, upper_bound)
+            )
+            with span("render:outliers"):
+                st.plotly_chart(fig, use_container_width=True)
+            
+            if outlier_count > 0:
+                st.write("**Outlier Records:**")
+                st.dataframe(outliers)
+
+def show_insights():
+    st.title("🔍 Advanced Data Insights")
+    st.write("Deep dive into shopping patterns with advanced analytics and statistical insights.")
+    
+    # Tải dữ liệu
+    with span("load"):
+        backend = get_backend()
+        # Truy vấn đầu tiên mới nạp dữ liệu; gọi ở đây để thời gian nạp nằm trong span load
+        backend.count()
+    # Figure được cache theo phiên bản dữ liệu + tuỳ chọn của từng biểu đồ
+    version = get_data_version()
+    
+    _correlation_section(backend, version)
+    _segmentation_section(backend, version)
+    _statistical_section(backend, version)
+    
+    # Top Insights Summary
+    st.subheader("💡 Key Insights")
+    
+    # Calculate key insights
+    with span("aggregate:insights"):
+        totals = backend.aggregate()
+        avg_purchase = totals[('Purchase Amount (USD)', 'mean')]
+        top_category = backend.aggregate('Category')[('Purchase Amount (USD)', 'sum')].idxmax()
+        top_gender = backend.aggregate('Gender')[('Purchase Amount (USD)', 'sum')].idxmax()
+        peak_season = backend.aggregate('Season')[('Purchase Amount (USD)', 'sum')].idxmax()
+    
+    insights = [
+        f"💰 Average purchase amount is ${avg_purchase:.2f}",
+        f"🏆 Top performing category: {top_category}",
+        f"👤 {top_gender} customers generate higher total revenue",
+        f"🌟 {peak_season} is the peak shopping season",
+        f"📊 {totals[('Review Rating', 'mean')]:.2f} average customer satisfaction rating"
+    ]
+    
+    for insight in insights:
+        st.write(f"• {insight}")
+    
+    show_figure_cache_stats()
\ No newline at end of file
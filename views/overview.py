@@ -0,0 +1,91 @@
+import streamlit as st
+from utils.backend import get_backend
+from utils.data_loader import get_manifest
+from utils.export import show_export
+from utils.perf import span
+from utils.table_view import show_paged_table
+
+def show_overview():
+    st.title("Shopping Trends Overview")
+    st.write("Explore key insights from shopping trends data.")
+
+    # Tải dữ liệu (pandas hoặc DuckDB, chọn bằng SHOPPING_BACKEND)
+    # Backend nạp dữ liệu khi được truy vấn lần đầu, nên đếm số dòng ngay trong span để đo đúng bước load
+    with span("load"):
+        backend = get_backend()
+        backend.count()
+    
+    # Hiển thị thông tin tổng quan về dataset (đọc từ manifest, không quét dữ liệu)
+    manifest = get_manifest()
+    columns = manifest["columns"]
+    total_records = manifest["rows"]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Records", total_records)
+    with col2:
+        st.metric("Total Categories", columns["Category"]["distinct"])
+    with col3:
+        st.metric("Avg Purchase Amount", f"${columns['Purchase Amount (USD)']['mean']:.2f}")
+    with col4:
+        st.metric("Avg Rating", f"{columns['Review Rating']['mean']:.2f}")
+
+    st.markdown("---")
+    
+    # Bộ lọc tương tác
+    st.subheader("🔍 Filter Dataset")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        gender = st.selectbox("Select Gender", ["All"] + sorted(backend.values("Gender")))
+    with col2:
+        category = st.selectbox("Select Category", ["All"] + sorted(backend.values("Category")))
+    with col3:
+        season = st.selectbox("Select Season", ["All"] + sorted(backend.values("Season")))
+
+    # Áp dụng bộ lọc
+    filters = {}
+    if gender != "All":
+        filters["Gender"] = gender
+    if category != "All":
+        filters["Category"] = category
+    if season != "All":
+        filters["Season"] = season
+    with span("filter"):
+        matched = backend.count(filters)
+    
+    # Hiển thị số lượng records sau khi filter
+    st.write(f"**Showing {matched} of {total_records} records**")
+    
+    # Hiển thị dữ liệu đã được filter, theo từng trang
+    st.subheader("📊 Dataset")
+    with span("render:table"):
+        show_paged_table(backend, filters, key="overview_table")
+    
+    # Xuất các dòng đã lọc (và các cột đang xem trong bảng) ra CSV/Parquet
+    with st.expander("⬇️ Export Filtered Data"):
+        show_export(backend, filters, st.session_state.get("overview_table_columns"), key="overview_export")
+
+    # Báo cáo bộ nhớ của schema gọn (Categorical + downcast)
+    with st.expander("💾 Memory Footprint"):
+        with span("aggregate:memory_report"):
+            report = backend.memory_report()
+        if report is None:
+            st.caption(f"The {backend.name} backend queries the Parquet data in place; no dataset is held in memory.")
+        else:
+            before, after = report["Before (bytes)"].sum(), report["After (bytes)"].sum()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Before", f"{before / 1024**2:.2f} MB")
+            col2.metric("After", f"{after / 1024**2:.2f} MB")
+            col3.metric("Reduction", f"{before / max(after, 1):.1f}x")
+            st.dataframe(report, hide_index=True, use_container_width=True)
+        
+        # Dataset được map từ file Arrow: session mới không tốn thêm bộ nhớ cho dữ liệu
+        sharing = backend.sharing_report(st.session_state)
+        if sharing is not None:
+            st.write("**Shared vs per-session memory**")
+            st.dataframe(
+                sharing.assign(MB=sharing["Bytes"] / 1024**2),
+                hide_index=True,
+                use_container_width=True,
+                column_config={"MB": st.column_config.NumberColumn(format="%.2f")}
+            )
\ No newline at end of file
@@ -0,0 +1,298 @@
+import streamlit as st
+from functools import partial
+import plotly.express as px
+from utils.backend import get_backend
+from utils.cube import ROWS
+from utils.data_loader import get_data_version
+from utils.figure_cache import figure_key, get_figure_cache, show_figure_cache_stats
+from utils.perf import fragment_span, span
+from utils.distributions import SAMPLE_SIZE
+from utils.scatter import SCATTER_POINT_LIMIT, binned_scatter_figure
+from utils.summary_plots import box_figure, violin_figure
+
+# Lựa chọn của các widget trong từng phần; phần tử đầu là giá trị mặc định
+CHART_TYPES = ["Bar Chart", "Box Plot", "Violin Plot"]
+GROUP_BY_OPTIONS = ["Category", "Gender", "Season"]
+COLOR_BY_OPTIONS = ["Gender", "Category", "Season"]
+SIZE_BY_OPTIONS = ["Purchase Amount (USD)", "Review Rating", "Previous Purchases"]
+CATEGORY_METRICS = ["Purchase Amount (USD)", "Review Rating", "Previous Purchases"]
+SEASONAL_METRICS = ["Purchase Amount (USD)", "Review Rating", "Item Count"]
+
+def _purchase_amount_chart(backend, filters, chart1_type, group_by):
+    if chart1_type == "Bar Chart":
+        fig1 = px.bar(
+            backend.aggregate(group_by, filters)[("Purchase Amount (USD)", "mean")]
+            .rename("Purchase Amount (USD)").reset_index(),
+            x=group_by,
+            y="Purchase Amount (USD)",
+            title=f"Average Purchase Amount by {group_by}",
+            color=group_by
+        )
+    elif chart1_type == "Box Plot":
+        fig1 = box_figure(
+            backend.box_stats("Purchase Amount (USD)", group_by, filters),
+            x=group_by,
+            y="Purchase Amount (USD)",
+            title=f"Purchase Amount Distribution by {group_by}"
+        )
+    else:  # Violin Plot
+        fig1 = violin_figure(
+            backend.violin_stats("Purchase Amount (USD)", group_by, filters),
+            x=group_by,
+            y="Purchase Amount (USD)",
+            title=f"Purchase Amount Distribution by {group_by}"
+        )
+    
+    fig1.update_layout(showlegend=False)
+    return fig1
+
+def _age_scatter_chart(backend, filters, color_by, size_by, scatter_mode, sample_size):
+    # Chỉ lấy các cột biểu đồ cần; chế độ dữ liệu lớn chỉ nhận lưới mật độ hoặc mẫu đã tính trong backend
+    columns = list(dict.fromkeys(["Age", "Purchase Amount (USD)", color_by, size_by, "Category", "Season", "Review Rating"]))
+    if scatter_mode == "All":
+        data, rows = backend.select(filters, columns)
+        return px.scatter(
+            data.iloc[rows],
+            x="Age",
+            y="Purchase Amount (USD)",
+            color=color_by,
+            size=size_by,
+            hover_data=["Category", "Season", "Review Rating"],
+            title="Age vs Purchase Amount",
+            opacity=0.7
+        )
+    if scatter_mode == "Density":
+        return binned_scatter_figure(
+            backend.density_grid("Age", "Purchase Amount (USD)", color_by, size_by, filters=filters),
+            "Age", "Purchase Amount (USD)", color_by, size_by,
+            title="Age vs Purchase Amount (binned density)"
+        )
+    return px.scatter(
+        backend.sample(filters, columns, color_by, size=sample_size),
+        x="Age",
+        y="Purchase Amount (USD)",
+        color=color_by,
+        size=size_by,
+        hover_data=["Category", "Season", "Review Rating"],
+        title="Age vs Purchase Amount (stratified sample)",
+        opacity=0.7,
+        render_mode="webgl"
+    )
+
+def _category_chart(backend, filters, metric_choice):
+    category_data = backend.aggregate("Category", filters)[[
+        ("Purchase Amount (USD)", "sum"),
+        ("Review Rating", "mean"),
+        ("Previous Purchases", "mean")
+    ]].round(2)
+    if metric_choice == "Purchase Amount (USD)":
+        chart_data = category_data[("Purchase Amount (USD)", "sum")].reset_index()
+        chart_data.columns = ["Category", "Total Purchase Amount"]
+        return px.bar(chart_data, x="Category", y="Total Purchase Amount",
+                     title="Total Purchase Amount by Category")
+    elif metric_choice == "Review Rating":
+        chart_data = category_data[("Review Rating", "mean")].reset_index()
+        chart_data.columns = ["Category", "Average Rating"]
+        return px.bar(chart_data, x="Category", y="Average Rating",
+                     title="Average Review Rating by Category")
+    else:
+        chart_data = category_data[("Previous Purchases", "mean")].reset_index()
+        chart_data.columns = ["Category", "Average Previous Purchases"]
+        return px.bar(chart_data, x="Category", y="Average Previous Purchases",
+                     title="Average Previous Purchases by Category")
+
+def _seasonal_chart(backend, filters, seasonal_metric):
+    seasonal_stats = backend.aggregate(["Season", "Gender"], filters)
+    if seasonal_metric == "Item Count":
+        seasonal_data = seasonal_stats[(ROWS, "count")].rename("Count").reset_index()
+        return px.bar(seasonal_data, x="Season", y="Count", color="Gender",
+                     title="Number of Purchases by Season and Gender", barmode="group")
+    seasonal_data = seasonal_stats[(seasonal_metric, "mean")].rename(seasonal_metric).reset_index()
+    return px.line(seasonal_data, x="Season", y=seasonal_metric, color="Gender",
+                  title=f"Average {seasonal_metric} by Season and Gender", markers=True)
+
+def _scatter_mode(matched, point_limit, large_mode):
+    # Chế độ vẽ scatter và cỡ mẫu theo số dòng đã lọc
+    if matched <= point_limit:
+        return "All", min(SAMPLE_SIZE, point_limit)
+    return large_mode, min(SAMPLE_SIZE, point_limit)
+
+# (khoá cache, builder) của từng figure, dùng chung cho lần dựng đầu và các lần đọc cache
+def _purchase_amount_figure(backend, version, filters, chart1_type, group_by):
+    return (
+        figure_key("purchase_amount", version, filters, chart1_type=chart1_type, group_by=group_by),
+        partial(_purchase_amount_chart, backend, filters, chart1_type, group_by)
+    )
+
+def _age_scatter_figure(backend, version, filters, color_by, size_by, scatter_mode, sample_size):
+    return (
+        figure_key(
+            "age_scatter", version, filters,
+            color_by=color_by, size_by=size_by, scatter_mode=scatter_mode, sample_size=sample_size
+        ),
+        partial(_age_scatter_chart, backend, filters, color_by, size_by, scatter_mode, sample_size)
+    )
+
+def _category_figure(backend, version, filters, metric_choice):
+    return (
+        figure_key("category_performance", version, filters, metric_choice=metric_choice),
+        partial(_category_chart, backend, filters, metric_choice)
+    )
+
+def _seasonal_figure(backend, version, filters, seasonal_metric):
+    return (
+        figure_key("seasonal", version, filters, seasonal_metric=seasonal_metric),
+        partial(_seasonal_chart, backend, filters, seasonal_metric)
+    )
+
+# Mỗi phần biểu đồ là một fragment: widget bên trong chỉ chạy lại phần đó.
+# Phụ thuộc vào bộ lọc chung được truyền qua tham số; đổi bộ lọc ở sidebar chạy lại cả trang.
+@st.fragment
+def _purchase_amount_section(backend, version, filters):
+    with fragment_span("purchase_amount"):
+        st.subheader("💰 Purchase Amount Analysis")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            chart1_type = st.selectbox("Chart Type", CHART_TYPES, key="purchase_chart_type")
+        with col2:
+            group_by = st.selectbox("Group By", GROUP_BY_OPTIONS, key="purchase_group_by")
+        
+        fig1 = get_figure_cache().get_or_build(*_purchase_amount_figure(backend, version, filters, chart1_type, group_by))
+        with span("render:purchase_amount"):
+            st.plotly_chart(fig1, use_container_width=True)
+
+@st.fragment
+def _age_section(backend, version, filters, matched):
+    with fragment_span("age_scatter"):
+        st.subheader("👥 Age and Purchase Patterns")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            color_by = st.selectbox("Color By", COLOR_BY_OPTIONS, key="scatter_color")
+        with col2:
+            size_by = st.selectbox("Size By", SIZE_BY_OPTIONS, key="scatter_size")
+        
+        # Chế độ dữ liệu lớn: mật độ 2D hoặc mẫu phân tầng, vẽ bằng WebGL
+        with st.expander("⚙️ Large-data mode"):
+            col1, col2 = st.columns(2)
+            with col1:
+                point_limit = st.number_input(
+                    "Point limit", min_value=1_000, value=SCATTER_POINT_LIMIT, step=10_000, key="scatter_limit"
+                )
+            with col2:
+                large_mode = st.radio("Render as", ["Density", "Sample"], horizontal=True, key="scatter_mode")
+        
+        scatter_mode, sample_size = _scatter_mode(matched, point_limit, large_mode)
+        if scatter_mode == "All":
+            st.caption(f"🔵 Showing all {matched:,} points")
+        elif scatter_mode == "Density":
+            st.caption(f"⚡ Large-data mode: binned density of {matched:,} rows (point limit {point_limit:,})")
+        else:
+            st.caption(f"⚡ Large-data mode: stratified sample of up to {sample_size:,} of {matched:,} rows")
+        
+        fig2 = get_figure_cache().get_or_build(
+            *_age_scatter_figure(backend, version, filters, color_by, size_by, scatter_mode, sample_size)
+        )
+        with span("render:age_scatter"):
+            st.plotly_chart(fig2, use_container_width=True)
+
+@st.fragment
+def _category_section(backend, version, filters):
+    with fragment_span("category_performance"):
+        st.subheader("📊 Category Performance")
+        
+        metric_choice = st.selectbox("Select Metric", CATEGORY_METRICS, key="category_metric")
+        
+        fig3 = get_figure_cache().get_or_build(*_category_figure(backend, version, filters, metric_choice))
+        with span("render:category_performance"):
+            st.plotly_chart(fig3, use_container_width=True)
+
+@st.fragment
+def _seasonal_section(backend, version, filters):
+    with fragment_span("seasonal"):
+        st.subheader("🌟 Seasonal Analysis")
+        
+        seasonal_metric = st.selectbox("Seasonal Metric", SEASONAL_METRICS, key="seasonal")
+        
+        fig4 = get_figure_cache().get_or_build(*_seasonal_figure(backend, version, filters, seasonal_metric))
+        with span("render:seasonal"):
+            st.plotly_chart(fig4, use_container_width=True)
+
+def show_visualizations():
+    st.title("📈 Interactive Data Visualizations")
+    st.write("Explore shopping trends through interactive charts and filters.")
+    
+    # Tải dữ liệu
+    with span("load"):
+        backend = get_backend()
+        categories = backend.values("Category")
+        genders = backend.values("Gender")
+        min_age, max_age = (int(value) for value in backend.value_range("Age"))
+    
+    # Sidebar filters cho toàn bộ visualizations
+    st.sidebar.subheader("🎛️ Visualization Filters")
+    
+    # Filters
+    selected_categories = st.sidebar.multiselect(
+        "Select Categories",
+        options=categories,
+        default=categories[:5]
+    )
+    
+    selected_genders = st.sidebar.multiselect(
+        "Select Genders",
+        options=genders,
+        default=genders
+    )
+    
+    age_range = st.sidebar.slider(
+        "Age Range",
+        min_value=min_age,
+        max_value=max_age,
+        value=(min_age, max_age)
+    )
+    
+    # Áp dụng filters
+    filters = {
+        "Category": selected_categories,
+        "Gender": selected_genders,
+        "Age": age_range,
+    }
+    with span("filter"):
+        matched = backend.count(filters)
+    
+    if matched == 0:
+        st.warning("No data matches your filters. Please adjust your selection.")
+        return
+    
+    st.write(f"**Displaying data for {matched} records**")
+    
+    # Các biểu đồ group-by dùng aggregate của backend; box/violin và scatter dữ liệu lớn dùng thống kê backend tính sẵn
+    # Figure được cache theo phiên bản dữ liệu + bộ lọc + tuỳ chọn của từng biểu đồ
+    version = get_data_version()
+    
+    _purchase_amount_section(backend, version, filters)
+    _age_section(backend, version, filters, matched)
+    _category_section(backend, version, filters)
+    _seasonal_section(backend, version, filters)
+    
+    # Interactive Summary Statistics
+    st.subheader("📋 Summary Statistics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Top 5 Categories by Purchase Volume**")
+        with span("aggregate:category"):
+            category_stats = backend.aggregate("Category", filters)
+        top_categories = category_stats[("Purchase Amount (USD)", "sum")].rename("Purchase Amount (USD)").nlargest(5)
+        st.dataframe(top_categories)
+    
+    with col2:
+        st.write("**Purchase Distribution by Gender**")
+        with span("aggregate:gender"):
+            gender_dist = backend.aggregate("Gender", filters)["Purchase Amount (USD)"][['count', 'mean', 'sum']]
+        st.dataframe(gender_dist)
+    
+    show_figure_cache_stats()